@@ -169,4 +169,33 @@ __version__ = VERSION
 __author__ = AUTHOR
 __email__ = EMAIL
 __license__ = LICENSE
-__all__ = [_ for _ in dir() if not _.startswith("_")]
+
+# Top-level names that are imported from their submodule only upon first
+# access, so that ``import ml_lib`` stays cheap (see ``__getattr__``).
+_LAZY_EXPORTS = {
+    "Foo": "foo_module",
+    "Bar": "bar_module",
+    "Baz": "nested.baz_module",
+}
+__all__ = [_ for _ in dir() if not _.startswith("_")] + list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    """
+    Module-level ``__getattr__`` (PEP 562), only called for names that are
+    not found in the module. Lazy exports are imported and cached here.
+    """
+    if name in _LAZY_EXPORTS:
+        # relative import, equivalent to "from .submodule import name"
+        module = __import__(_LAZY_EXPORTS[name], globals(), None, [name], 1)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
+
+
+def __dir__():
+    """
+    Include the lazy exports, even if not imported yet.
+    """
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
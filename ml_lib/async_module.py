@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module with asyncio-friendly counterparts of Foo and Bar, whose ``loop``
+is a coroutine that periodically hands control back to the event loop.
+"""
+
+
+from typing import Optional
+import asyncio
+from concurrent.futures import Executor
+from .foo_module import Foo, iterations
+from .bar_module import Bar
+
+
+class AsyncLoopMixin(object):
+    """
+    Replaces ``loop`` with a coroutine that runs the computation in chunks
+    of ``yield_every`` iterations. Between chunks it yields to the event
+    loop, so other coroutines are not blocked for longer than one chunk.
+    Alternatively, chunks can be offloaded to an executor.
+    """
+
+    __slots__ = ()
+
+    # default number of iterations between yields to the event loop
+    YIELD_EVERY: int = 100
+
+    async def loop(
+        self,
+        times: int,
+        yield_every: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        resume: bool = False,
+    ) -> None:
+        """
+        Restart result and run computation a number of times.
+
+        :param times: number of iterations, see ``Foo.loop``.
+        :param yield_every: Iterations per chunk. Defaults to
+          ``YIELD_EVERY``.
+        :param executor: If given, chunks run in this executor (e.g. a
+          ``ThreadPoolExecutor``) instead of the event loop thread. Chunks
+          are run one after the other, never concurrently.
+        :param resume: If true, continue from the current result.
+
+        If the computation has a closed form (see ``Foo._advance``), it runs
+        in a single O(1) step, without chunks.
+        """
+        if yield_every is None:
+            yield_every = self.YIELD_EVERY
+        assert yield_every > 0, "yield_every has to be a positive int!"
+        times = iterations(times)
+        if not resume:
+            self._restart()
+        if self._has_closed_form():
+            self._run(times)
+            return
+        event_loop = asyncio.get_running_loop()
+        with self._backend.session(self):
+            for beg in range(0, times, yield_every):
+                chunk = min(yield_every, times - beg)
+                if executor is None:
+                    self._run(chunk)
+                    await asyncio.sleep(0)
+                else:
+                    await event_loop.run_in_executor(
+                        executor, self._run, chunk
+                    )
+
+    async def advance(
+        self,
+        times: int,
+        yield_every: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Continue the computation for a number of times, without restarting.
+        Equivalent to ``loop(times, yield_every, executor, resume=True)``.
+        """
+        await self.loop(
+            times, yield_every=yield_every, executor=executor, resume=True
+        )
+
+
+class AsyncFoo(AsyncLoopMixin, Foo):
+    """
+    Foo with an awaitable ``loop``.
+    """
+
+    __slots__ = ()
+
+
+class AsyncBar(AsyncLoopMixin, Bar):
+    """
+    Bar with an awaitable ``loop``. Each iteration is O(n), so consider a
+    smaller ``yield_every`` for large sizes.
+    """
+
+    __slots__ = ()
+
+    YIELD_EVERY: int = 1
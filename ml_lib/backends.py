@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module with the interchangeable compute backends that run the iterations
+of ``Foo.loop`` and subclasses:
+
+* ``python``: the plain interpreter path, see ``Foo._steps``.
+* ``numpy``: uses the ``_numpy_steps`` method of the instance, if its class
+  provides one (e.g. ``Bar``), falling back to ``python`` otherwise.
+* ``process``: splits long loops across a pool of worker processes.
+* ``jit``: uses the ``_jit_steps`` method of the instance, if its class
+  provides one and Numba is installed, falling back to ``python`` otherwise.
+
+The backend is selected per instance (``backend=`` argument or
+``set_backend``), defaulting to the ``ML_LIB_BACKEND`` environment variable
+and then to ``python``.
+"""
+
+
+from typing import Optional, Iterator, Dict, List
+from contextlib import contextmanager
+import os
+import threading
+from .storage import HAS_NUMPY
+from .parallel import LoopPool
+from .jit import HAS_NUMBA
+
+
+BACKEND_ENV_VAR = "ML_LIB_BACKEND"
+
+
+class PythonBackend(object):
+    """
+    Runs the iterations in the interpreter.
+    """
+
+    name = "python"
+
+    def run(self, instance, times: int) -> None:
+        """
+        Run ``times`` iterations on ``instance``, without restarting it.
+        """
+        instance._steps(times)
+
+    @contextmanager
+    def session(self, instance) -> Iterator[None]:
+        """
+        Context of a single ``loop`` or ``iter_loop`` call on ``instance``,
+        that may call ``run`` several times. Backends can keep resources
+        (e.g. a process pool) across those calls, and release them on exit.
+        """
+        yield
+
+
+class NumpyBackend(PythonBackend):
+    """
+    Runs the iterations with the NumPy-vectorized ``_numpy_steps`` method,
+    if the most derived ``_computation`` comes with one.
+    """
+
+    name = "numpy"
+
+    def run(self, instance, times: int) -> None:
+        if instance._provides("_numpy_steps"):
+            instance._numpy_steps(times)
+        else:
+            instance._steps(times)
+
+
+class ProcessBackend(PythonBackend):
+    """
+    Splits loops across a temporary ``LoopPool``. Since starting a pool is
+    expensive, loops with a closed form or with less than ``min_times``
+    iterations per worker are run in the current process, and within a
+    ``session`` (e.g. the chunks of ``iter_loop``) a single pool is reused.
+    Note that side effects of the computation other than the result stay
+    in the workers, and that the workers don't see changes to the instance
+    made during a session.
+    """
+
+    name = "process"
+
+    def __init__(self, workers: Optional[int] = None, min_times: int = 100):
+        """
+        :param workers: Number of processes, by default ``os.cpu_count()``.
+        :param min_times: Minimum iterations per worker.
+        """
+        self.workers: int = workers or os.cpu_count() or 1
+        self.min_times: int = min_times
+        self._lock = threading.Lock()
+        # open sessions by instance: their count and pool (created lazily)
+        self._sessions: Dict[int, List] = {}
+
+    def __getstate__(self):
+        """
+        Pools are not picklable, and belong to the current process anyway.
+        """
+        state = dict(self.__dict__)
+        del state["_lock"]
+        state["_sessions"] = {}
+        return state
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def session(self, instance) -> Iterator[None]:
+        """
+        See ``PythonBackend.session``. Sessions on the same instance (e.g.
+        nested, or from several threads) share the pool, which is closed
+        when the last of them exits.
+        """
+        key = id(instance)
+        with self._lock:
+            entry = self._sessions.setdefault(key, [0, None])
+            entry[0] += 1
+        try:
+            yield
+        finally:
+            pool = None
+            with self._lock:
+                entry[0] -= 1
+                if entry[0] == 0:
+                    del self._sessions[key]
+                    pool = entry[1]
+            if pool is not None:
+                pool.close()
+
+    def run(self, instance, times: int) -> None:
+        workers = min(self.workers, times // self.min_times)
+        if workers <= 1 or instance._has_closed_form():
+            instance._steps(times)
+            return
+        with self._lock:
+            entry = self._sessions.get(id(instance))
+            if entry is not None and entry[1] is None:
+                entry[1] = LoopPool(instance, self.workers)
+            pool = None if entry is None else entry[1]
+        if pool is None:
+            with LoopPool(instance, workers) as pool:
+                instance._result += pool.run(times)
+        else:
+            instance._result += pool.run(times)
+
+
+class JitBackend(PythonBackend):
+    """
+    Runs the iterations with the natively compiled ``_jit_steps`` method,
+    if Numba is installed and the most derived ``_computation`` comes with
+    one.
+    """
+
+    name = "jit"
+
+    def run(self, instance, times: int) -> None:
+        if HAS_NUMBA and instance._provides("_jit_steps"):
+            instance._jit_steps(times)
+        else:
+            instance._steps(times)
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (
+        PythonBackend(),
+        NumpyBackend(),
+        ProcessBackend(),
+        JitBackend(),
+    )
+}
+
+
+def get_backend(name: Optional[str] = None) -> PythonBackend:
+    """
+    :param name: One of ``BACKENDS``. By default, the value of the
+      ``ML_LIB_BACKEND`` environment variable, or ``python`` if unset.
+    :returns: The corresponding backend.
+    :raises ImportError: If the ``numpy`` backend is requested but NumPy is
+      not installed.
+    """
+    if name is None:
+        name = os.environ.get(BACKEND_ENV_VAR, PythonBackend.name)
+    assert name in BACKENDS, "backend must be one of {}".format(list(BACKENDS))
+    if name == NumpyBackend.name and not HAS_NUMPY:
+        raise ImportError("numpy backend requires numpy to be installed")
+    return BACKENDS[name]
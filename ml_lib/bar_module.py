@@ -6,8 +6,26 @@
 Module mimicking foo with more expensive memory and runtime requirements.
 """
 
-from typing import List
+from typing import Sequence, Iterable, Optional, Dict
+import sys
 from .foo_module import Foo
+from .storage import materialize, extend, index_of, mutable_copy
+from .storage import typecode_of, from_buffer, packed, STORAGES, PAGE_SIZE
+from .cache import BUFFER_CACHE
+from .memory import charge, estimate
+from .backends import get_backend
+from .jit import get_kernel
+
+
+def _from_buffer(cls, storage: str, typecode: str, data):
+    """
+    Unpickling helper for ``Bar.__reduce_ex__``: a new, uninitialized
+    instance of ``cls`` with the data rebuilt from ``data``. The rest of the
+    state is set afterwards by ``pickle``.
+    """
+    bar = cls.__new__(cls)
+    bar._x = from_buffer(data, storage, typecode)
+    return bar
 
 
 class Bar(Foo):
@@ -15,17 +33,273 @@ class Bar(Foo):
     Similar to Foo, with higher memory and runtime requirements.
     """
 
-    def __init__(self, size: int = 1000000):
+    __slots__ = ("_storage", "_shared", "_index")
+
+    # class recorded in the snapshots written by ``save``, which must be the
+    # one that loads them. None means the class of the instance
+    SNAPSHOT_CLASS: Optional[type] = None
+
+    def __init__(
+        self,
+        size: int = 1000000,
+        storage: str = "list",
+        shared: bool = False,
+        backend: Optional[str] = None,
+        page_size: int = PAGE_SIZE,
+    ):
         """
         The instance will contain a list instead of a range, so memory
         complexity is O(n) instead of 2*O(1)
+
+        :param storage: Container for the data, one of
+          ``ml_lib.storage.STORAGES``. Buffer storages use the narrowest
+          integer width that fits ``size``. The ``paged`` storage allocates
+          the elements lazily, in pages of ``page_size``, so construction
+          is O(1) and memory grows with the pages actually accessed.
+        :param shared: If true, the data is an immutable buffer taken from
+          ``ml_lib.cache.BUFFER_CACHE`` and shared with other instances of
+          the same size and storage. It is copied upon first mutation. A
+          cache miss is charged to the memory budget, see
+          ``BufferCache.get``.
+        :param backend: See ``Foo``. The ``numpy`` backend vectorizes the
+          lookup performed by ``_computation``.
+        :param page_size: Elements per page of the ``paged`` storage.
+          Shared paged data always uses ``ml_lib.storage.PAGE_SIZE``.
+        :raises MemoryBudgetExceeded: If a budget was set with
+          ``ml_lib.memory.set_budget`` and the data doesn't fit in it.
+        """
+        super(Bar, self).__init__(size, backend)
+        self._storage: str = storage
+        self._shared: bool = shared
+        if shared:
+            self._x: Sequence[int] = BUFFER_CACHE.get(size, storage, self)
+        else:
+            charge(self, estimate(size, storage))
+            self._x = materialize(
+                self._x, storage, 0, size - 1, page_size
+            )  # memory overhead
+        self._index: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def from_iterable(
+        cls,
+        data: Iterable[int],
+        storage: str = "list",
+        backend: Optional[str] = None,
+    ):
+        """
+        Alternative constructor for arbitrary integer data instead of
+        ``range(size)``. The returned instance keeps a value->position
+        index, so ``index`` (and therefore ``_computation``) runs in O(1) at
+        the cost of an extra O(n) memory.
+
+        :param data: Non-empty sequence of integers.
+        :param storage: See ``__init__``.
+        :param backend: See ``__init__``.
+        """
+        data = list(data)
+        assert len(data) > 0, "data can't be empty!"
+        bar = cls.__new__(cls)
+        bar._result = 0
+        bar._backend = get_backend(backend)
+        bar._storage = storage
+        bar._shared = False
+        lo, hi = min(data), max(data)
+        charge(bar, estimate(len(data), storage, lo, hi))
+        bar._x = materialize(data, storage, lo, hi)
+        bar._index = {}
+        bar._update_index(data, 0)
+        return bar
+
+    def _update_index(self, values: Sequence[int], offset: int) -> None:
+        """
+        Register ``values``, located at ``offset`` onwards, in the
+        value->position index. Existing entries are kept, since lookups
+        return the first occurrence like ``list.index``.
+        """
+        index = self._index
+        for pos, value in enumerate(values, offset):
+            if value not in index:
+                index[value] = pos
+
+    def extend(self, values: Iterable[int]) -> None:
+        """
+        Append ``values`` to the data, keeping the index (if any) up to date.
+        """
+        values = list(values)
+        offset = len(self._x)
+        if self._shared:
+            self._x = mutable_copy(self._x)
+            self._shared = False
+        self._x = extend(self._x, values, self._storage)
+        if self._index is not None:
+            self._update_index(values, offset)
+
+    def append(self, value: int) -> None:
+        """
+        Append a single ``value``, see ``extend``.
+        """
+        self.extend([value])
+
+    def __reduce_ex__(self, protocol: int):
+        """
+        Buffer-backed data (``array`` and ``numpy`` storages, also when
+        ``shared``) is pickled as raw bytes instead of element by element.
+        With protocol 5 or higher it is passed as a ``pickle.PickleBuffer``,
+        so it is written without intermediate copies, or sent out-of-band if
+        a ``buffer_callback`` is given. Lists use the default pickling. All
+        protocols are supported, see ``Foo.__getstate__``.
+        """
+        if self._storage not in ("array", "numpy"):
+            return super(Bar, self).__reduce_ex__(protocol)
+        state, slots = self.__getstate__()
+        x = slots.pop("_x")
+        slots["_shared"] = False  # the unpickled data is private
+        if protocol >= 5 and sys.version_info >= (3, 8):
+            from pickle import PickleBuffer
+
+            data = PickleBuffer(x)
+        else:
+            data = bytes(x)
+        return (
+            _from_buffer,
+            (type(self), self._storage, typecode_of(x), data),
+            (state, slots),
+        )
+
+    def save(self, path: str) -> None:
         """
-        super(Bar, self).__init__(size)
-        self._x: List[int] = list(self._x)  # memory overhead
+        Like ``Foo.save``, followed by the raw data. List (and paged) data is
+        stored with the narrowest integer width that fits it, and loaded as
+        a list. The value->position index of ``from_iterable`` instances is
+        not stored. The snapshot is written as ``SNAPSHOT_CLASS``, if set.
+        """
+        x = packed(self._x)
+        storage = self._storage if self._storage in STORAGES else "array"
+        if storage == "paged":
+            storage = "list"
+        from . import snapshot
+
+        snapshot.write(
+            path, self, storage, typecode_of(x), x, self.SNAPSHOT_CLASS
+        )
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        mmap: bool = True,
+        verify: bool = False,
+        backend: Optional[str] = None,
+    ):
+        """
+        :returns: A new instance with the state written by ``save``.
+        :param mmap: If true, the data is memory-mapped from the file
+          instead of read, so loading is O(1) regardless of the size. The
+          mapped data is read-only and copied upon first mutation, like
+          with ``shared``. Since lists can't be mapped, list data is loaded
+          with ``array`` storage. If false, the data is read and verified.
+        :param verify: If true, the mapped data is also verified, which
+          reads all of it.
+        :param backend: See ``__init__``.
+        :raises ValueError: See ``Foo.load``.
+        """
+        from . import snapshot
+
+        header = snapshot.read_header(path, cls)
+        bar = cls.__new__(cls)
+        bar._result = header.result
+        bar._backend = get_backend(backend)
+        bar._index = None
+        buffer_storage = "numpy" if header.storage == "numpy" else "array"
+        if mmap:
+            bar._storage = buffer_storage
+            bar._shared = True
+            bar._x = snapshot.map_data(path, header, buffer_storage, verify)
+        else:
+            bar._storage = header.storage
+            bar._shared = False
+            charge(bar, estimate(header.count, header.storage))
+            bar._x = snapshot.read_data(path, header, buffer_storage)
+            if header.storage == "list":
+                bar._x = bar._x.tolist()
+        return bar
+
+    def publish(self, name: Optional[str] = None):
+        """
+        Copy the data into a new shared memory block, so that other
+        processes can ``attach`` to it without copying.
+
+        :returns: A ``ml_lib.shm_module.SharedBar`` that owns the block.
+        """
+        from .shm_module import SharedBar
+
+        return SharedBar.publish(self, name)
+
+    @classmethod
+    def attach(cls, name: str, result: int = 0):
+        """
+        :returns: A ``ml_lib.shm_module.SharedBar`` attached to the shared
+          memory block created by ``publish`` with the given name.
+        """
+        from .shm_module import SharedBar
+
+        return SharedBar.attach(name, result)
+
+    def index(self, value: int) -> int:
+        """
+        :returns: Position of the first occurrence of ``value`` in the data.
+          O(1) for instances created via ``from_iterable``, O(n) otherwise.
+        :raises ValueError: if ``value`` is not present.
+        """
+        if self._index is not None:
+            try:
+                return self._index[value]
+            except KeyError:
+                raise ValueError("{} is not in Bar".format(value)) from None
+        return index_of(self._x, value)
 
     def _computation(self) -> None:
         """
         The computation will be 2*O(n) instead of O(1)
         """
         super(Bar, self)._computation()
-        self._x.index(len(self._x) - 1)  # runtime overhead
+        self.index(len(self._x) - 1)  # runtime overhead
+
+    def _numpy_steps(self, times: int) -> None:
+        """
+        Like ``_steps``, but the lookup of each iteration is a vectorized
+        comparison over a NumPy version of the data (zero-copy for array
+        and buffer storages). Used by the ``numpy`` backend.
+        """
+        if self._index is not None or self._storage == "paged":
+            self._steps(times)  # lookups are already O(1) or O(page_size)
+            return
+        import numpy
+
+        x = numpy.asarray(self._x)
+        value = len(x) - 1
+        for i in range(times):
+            super(Bar, self)._computation()
+            index_of(x, value)
+
+    def _jit_steps(self, times: int) -> None:
+        """
+        Like ``_steps``, but all iterations run in a single call to a
+        natively compiled kernel over a NumPy version of the data. Used by
+        the ``jit`` backend.
+        """
+        if self._index is not None or self._storage == "paged":
+            self._steps(times)  # lookups are already O(1) or O(page_size)
+            return
+        import numpy
+
+        x = numpy.asarray(self._x)
+        if x.dtype.kind not in "iu":  # e.g. object arrays for huge ints
+            self._steps(times)
+            return
+        if get_kernel("_bar_loop")(x, len(x) - 1, times):
+            self._result += times
+        elif times > 0:
+            super(Bar, self)._computation()  # first iteration, then fails
+            raise ValueError("{} is not in Bar".format(len(x) - 1))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module with struct-of-arrays containers that hold the state of many Foo or
+Bar instances in parallel NumPy arrays, so they can be updated together
+with a few vectorized operations instead of one Python call per instance.
+Requires NumPy.
+"""
+
+
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class FooBatch(object):
+    """
+    Batch of ``len(sizes)`` independent Foo instances.
+    """
+
+    def __init__(self, sizes: Sequence[int]):
+        """
+        :param sizes: One positive size per instance.
+        """
+        if np is None:
+            raise ImportError("{} requires numpy".format(type(self).__name__))
+        self._sizes = np.array(sizes, dtype=np.int64).reshape(-1)
+        assert (self._sizes > 0).all(), "sizes have to be positive ints!"
+        self._results = np.zeros_like(self._sizes)
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def _check_times(self, times_array: Sequence[int]):
+        """
+        :returns: ``times_array`` as an int64 array with one entry per
+          instance. A scalar is broadcast to all instances.
+        :raises TypeError: If the entries are not integers, like
+          ``Foo.loop``.
+        """
+        times = np.asarray(times_array)
+        if times.size and times.dtype.kind not in "biu":
+            raise TypeError(
+                "times have to be ints, not {}".format(times.dtype)
+            )
+        times = np.broadcast_to(times.astype(np.int64), self._sizes.shape)
+        assert (times >= 0).all(), "times have to be non-negative ints!"
+        return times
+
+    def loop(self, times_array: Sequence[int]) -> None:
+        """
+        Equivalent to ``instance.loop(times)`` for every instance and its
+        corresponding entry in ``times_array``.
+        """
+        times = self._check_times(times_array)
+        self._results = times.copy()
+
+    def get_results(self):
+        """
+        :returns: An int64 array with ``get_result()`` of every instance.
+        """
+        return self._results.copy()
+
+
+class BarBatch(FooBatch):
+    """
+    Batch of independent Bar instances. Since the data of a Bar is
+    ``range(size)``, it is kept implicitly: the value ``size-1`` looked up by
+    ``Bar._computation`` is always found, so the per-instance state and its
+    update are the same as for Foo, and no O(n) data is materialized.
+    """
+
+    pass
@@ -0,0 +1,410 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Benchmark suite for the documented costs of Foo and Bar. Every benchmark is
+run over a grid of sizes and iteration counts, recording wall time, CPU time
+and peak traced memory, and the results are stored as JSON. A stored
+baseline can be compared against new results to flag regressions.
+
+Usage example::
+  python -m ml_lib.bench run -o results.json -s 1000 100000 -t 10 1000
+  python -m ml_lib.bench compare baseline.json results.json
+"""
+
+
+from typing import Callable, Dict, List, Any, Sequence
+import sys
+import json
+import pickle
+import os.path
+import tempfile
+import threading
+import time
+import platform
+import argparse
+import tracemalloc
+from statistics import mean, variance
+from . import __version__
+from . import instrument
+from .foo_module import Foo
+from .bar_module import Bar
+from .concurrent_module import ConcurrentBar
+from .storage import HAS_NUMPY
+from .parallel import split
+
+
+# ##############################################################################
+# # REGISTRY
+# ##############################################################################
+# name -> (factory, uses_times). The factory receives (size, times), does any
+# setup and returns the zero-argument callable to be measured.
+BENCHMARKS: Dict[str, Any] = {}
+
+
+def benchmark(name: str, uses_times: bool = True) -> Callable:
+    """
+    Decorator to register a benchmark factory under ``name``. If
+    ``uses_times`` is false, the benchmark is run once per size only.
+    """
+
+    def register(factory: Callable) -> Callable:
+        BENCHMARKS[name] = (factory, uses_times)
+        return factory
+
+    return register
+
+
+@benchmark("Foo.init", uses_times=False)
+def _foo_init(size: int, times: int) -> Callable:
+    return lambda: Foo(size)
+
+
+@benchmark("Foo.loop")
+def _foo_loop(size: int, times: int) -> Callable:
+    foo = Foo(size)
+    return lambda: foo.loop(times)
+
+
+@benchmark("Foo.loop.instrumented")
+def _foo_loop_instrumented(size: int, times: int) -> Callable:
+    """
+    Cost of ``Foo.loop`` with a no-op hook registered, to be compared with
+    ``Foo.loop`` (i.e. the disabled path).
+    """
+    foo = Foo(size)
+
+    def fn() -> None:
+        hook = instrument.register(lambda *args: None, lambda *args: None)
+        try:
+            foo.loop(times)
+        finally:
+            instrument.unregister(hook)
+
+    return fn
+
+
+@benchmark("Foo.get_result", uses_times=False)
+def _foo_get_result(size: int, times: int) -> Callable:
+    return Foo(size).get_result
+
+
+@benchmark("Bar.init", uses_times=False)
+def _bar_init(size: int, times: int) -> Callable:
+    return lambda: Bar(size)
+
+
+@benchmark("Bar.init.paged", uses_times=False)
+def _bar_init_paged(size: int, times: int) -> Callable:
+    return lambda: Bar(size, storage="paged")
+
+
+@benchmark("Bar.loop")
+def _bar_loop(size: int, times: int) -> Callable:
+    bar = Bar(size)
+    return lambda: bar.loop(times)
+
+
+@benchmark("Bar.loop.budgeted")
+def _bar_loop_budgeted(size: int, times: int) -> Callable:
+    """
+    Cost of ``Bar.loop`` with a time budget that is never exhausted, to be
+    compared with ``Bar.loop`` (i.e. the overhead of the checks).
+    """
+    bar = Bar(size)
+    return lambda: bar.loop(times, max_seconds=3600)
+
+
+@benchmark("Bar.loop.paged")
+def _bar_loop_paged(size: int, times: int) -> Callable:
+    bar = Bar(size, storage="paged")
+    return lambda: bar.loop(times)
+
+
+@benchmark("Bar.loop.process")
+def _bar_loop_process(size: int, times: int) -> Callable:
+    bar = Bar(size, backend="process")
+    return lambda: bar.loop(times)
+
+
+if HAS_NUMPY:
+
+    @benchmark("Bar.loop.numpy")
+    def _bar_loop_numpy(size: int, times: int) -> Callable:
+        bar = Bar(size, storage="array", backend="numpy")
+        return lambda: bar.loop(times)
+
+
+@benchmark("Bar.loop.jit")
+def _bar_loop_jit(size: int, times: int) -> Callable:
+    """
+    Falls back to the python backend if Numba isn't installed.
+    """
+    bar = Bar(size, storage="array", backend="jit")
+    bar.loop(1)  # compile outside of the measurement
+    return lambda: bar.loop(times)
+
+
+@benchmark("Bar.pickle", uses_times=False)
+def _bar_pickle(size: int, times: int) -> Callable:
+    """
+    Pickling round trip of a list-backed Bar, element by element.
+    """
+    bar = Bar(size)
+    return lambda: pickle.loads(pickle.dumps(bar, pickle.HIGHEST_PROTOCOL))
+
+
+@benchmark("Bar.pickle.buffer", uses_times=False)
+def _bar_pickle_buffer(size: int, times: int) -> Callable:
+    """
+    Pickling round trip of an array-backed Bar, with in-band raw bytes.
+    """
+    bar = Bar(size, storage="array")
+    return lambda: pickle.loads(pickle.dumps(bar, pickle.HIGHEST_PROTOCOL))
+
+
+@benchmark("Bar.pickle.out_of_band", uses_times=False)
+def _bar_pickle_out_of_band(size: int, times: int) -> Callable:
+    """
+    Pickling round trip of an array-backed Bar with protocol 5, passing the
+    data out-of-band as it would be sent to another process.
+    """
+    bar = Bar(size, storage="array")
+
+    def fn() -> None:
+        buffers = []
+        data = pickle.dumps(bar, 5, buffer_callback=buffers.append)
+        pickle.loads(data, buffers=buffers)
+
+    return fn
+
+
+@benchmark("Bar.load", uses_times=False)
+def _bar_load(size: int, times: int) -> Callable:
+    """
+    Loading a snapshot of an array-backed Bar via memory map.
+    """
+    tmpdir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmpdir.name, "bar.snap")
+    Bar(size, storage="array").save(path)
+    fn = lambda: Bar.load(path)
+    fn.tmpdir = tmpdir  # removed once fn is collected
+    return fn
+
+
+def _concurrent_bar_loop(threads: int) -> Callable:
+    """
+    :returns: A benchmark factory for ``ConcurrentBar.loop`` with the
+      iterations split across ``threads`` threads. Compare across thread
+      counts to measure scaling, which needs a free-threaded build (see
+      ``gil_enabled`` in the results metadata).
+    """
+
+    def factory(size: int, times: int) -> Callable:
+        bar = ConcurrentBar(size)
+
+        def fn() -> None:
+            bar.reset()
+            workers = [
+                threading.Thread(target=bar.advance, args=(chunk,))
+                for chunk in split(times, threads)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        return fn
+
+    return factory
+
+
+for _threads in (1, 2, 4, 8):
+    benchmark("ConcurrentBar.loop.threads{}".format(_threads))(
+        _concurrent_bar_loop(_threads)
+    )
+
+
+@benchmark("Bar.get_result", uses_times=False)
+def _bar_get_result(size: int, times: int) -> Callable:
+    return Bar(size).get_result
+
+
+# ##############################################################################
+# # MEASUREMENT
+# ##############################################################################
+def measure(fn: Callable, repeats: int = 5) -> Dict[str, Any]:
+    """
+    :param fn: Zero-argument callable to be measured.
+    :param repeats: Number of timed runs, at least 2.
+    :returns: Dict with the ``wall`` and ``cpu`` seconds of each run, and
+      the ``peak_bytes`` allocated during one extra, traced run (tracing
+      slows down execution, so it is kept apart from the timed runs).
+    """
+    assert repeats >= 2, "At least 2 repeats needed for statistics!"
+    wall, cpu = [], []
+    for _ in range(repeats):
+        w0, c0 = time.perf_counter(), time.process_time()
+        fn()
+        c1, w1 = time.process_time(), time.perf_counter()
+        wall.append(w1 - w0)
+        cpu.append(c1 - c0)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"wall": wall, "cpu": cpu, "peak_bytes": peak}
+
+
+def run(
+    sizes: Sequence[int],
+    times: Sequence[int],
+    repeats: int = 5,
+    names: Sequence[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run the registered benchmarks over the ``sizes x times`` grid.
+
+    :param names: Subset of ``BENCHMARKS`` to run. All by default.
+    :returns: JSON-serializable dict with ``meta`` information and the
+      ``results`` of ``measure``, keyed by ``name[size=...,times=...]``.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        factory, uses_times = BENCHMARKS[name]
+        for size in sizes:
+            for t in times if uses_times else [None]:
+                key = "{}[size={}{}]".format(
+                    name, size, "" if t is None else ",times={}".format(t)
+                )
+                results[key] = measure(factory(size, t), repeats)
+    meta = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "gil_enabled": getattr(sys, "_is_gil_enabled", lambda: True)(),
+        "repeats": repeats,
+    }
+    return {"meta": meta, "results": results}
+
+
+# ##############################################################################
+# # COMPARISON
+# ##############################################################################
+def welch_t(a: Sequence[float], b: Sequence[float]) -> float:
+    """
+    :returns: Welch's t statistic for the difference ``mean(b) - mean(a)``.
+      Positive values mean that ``b`` is larger (i.e. slower).
+    """
+    var = variance(a) / len(a) + variance(b) / len(b)
+    diff = mean(b) - mean(a)
+    if var == 0:
+        return 0.0 if diff == 0 else float("inf") * diff
+    return diff / var ** 0.5
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.1,
+    t_crit: float = 3.0,
+) -> List[str]:
+    """
+    Compare two outputs of ``run``. A timing regression is flagged if the
+    mean wall time grew by more than ``threshold`` (relative) and the
+    growth is significant, i.e. Welch's t exceeds ``t_crit``. A memory
+    regression is flagged if the peak grew by more than ``threshold``.
+
+    :returns: One human-readable line per regression found.
+    """
+    regressions = []
+    base_results = baseline["results"]
+    for key, cur in current["results"].items():
+        if key not in base_results:
+            continue
+        base = base_results[key]
+        base_wall, cur_wall = mean(base["wall"]), mean(cur["wall"])
+        if (
+            cur_wall > base_wall * (1 + threshold)
+            and welch_t(base["wall"], cur["wall"]) > t_crit
+        ):
+            regressions.append(
+                "{}: wall time {:.3g}s -> {:.3g}s".format(
+                    key, base_wall, cur_wall
+                )
+            )
+        if cur["peak_bytes"] > base["peak_bytes"] * (1 + threshold):
+            regressions.append(
+                "{}: peak memory {}B -> {}B".format(
+                    key, base["peak_bytes"], cur["peak_bytes"]
+                )
+            )
+    return regressions
+
+
+# ##############################################################################
+# # CLI
+# ##############################################################################
+def main(argv: Sequence[str] = None) -> int:
+    """
+    Command line entry point, see module docstring.
+
+    :returns: Exit code, 1 if ``compare`` found regressions.
+    """
+    parser = argparse.ArgumentParser("python -m ml_lib.bench")
+    subparsers = parser.add_subparsers(dest="command")
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("-o", "--output", type=str, required=True)
+    run_parser.add_argument(
+        "-s", "--sizes", nargs="+", type=int, default=[1000, 100000]
+    )
+    run_parser.add_argument(
+        "-t", "--times", nargs="+", type=int, default=[10, 1000]
+    )
+    run_parser.add_argument("-r", "--repeats", type=int, default=5)
+    run_parser.add_argument(
+        "-b",
+        "--benchmarks",
+        nargs="+",
+        type=str,
+        default=None,
+        choices=sorted(BENCHMARKS),
+        help="Subset of benchmarks to run. All by default",
+    )
+    cmp_parser = subparsers.add_parser("compare", help="Find regressions")
+    cmp_parser.add_argument("baseline", type=str)
+    cmp_parser.add_argument("current", type=str)
+    cmp_parser.add_argument("--threshold", type=float, default=0.1)
+    cmp_parser.add_argument("--t_crit", type=float, default=3.0)
+    args = parser.parse_args(argv)
+    #
+    if args.command == "run":
+        results = run(args.sizes, args.times, args.repeats, args.benchmarks)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        for key, res in results["results"].items():
+            print(
+                "{:<40} wall={:.3e}s cpu={:.3e}s peak={}B".format(
+                    key, mean(res["wall"]), mean(res["cpu"]), res["peak_bytes"]
+                )
+            )
+        return 0
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold, args.t_crit)
+        for line in regressions:
+            print("REGRESSION", line)
+        return 1 if regressions else 0
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
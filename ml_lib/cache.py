@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module with a process-wide cache of materialized Bar data, so that Bars of
+the same size and storage share a single immutable buffer instead of each
+building its own. See ``Bar(..., shared=True)``.
+"""
+
+
+from typing import Any, Dict, Sequence, Tuple
+from collections import OrderedDict
+from .storage import materialize, nbytes, readonly, PagedRange
+from .memory import charge, estimate
+
+
+class _Entry(object):
+    """
+    A cached buffer and its size in bytes. The buffer is charged to the
+    memory budget until the entry is evicted and collected.
+    """
+
+    __slots__ = ("buf", "nbytes", "__weakref__")
+
+
+class BufferCache(object):
+    """
+    LRU cache of read-only ``range(size)`` buffers, keyed by
+    ``(size, storage)``. Least recently used entries are evicted once the
+    total cached bytes exceed ``max_bytes``. Buffers larger than
+    ``max_bytes`` are returned but not cached. Paged buffers grow as their
+    pages are materialized, so they are re-measured upon every ``get`` and
+    ``stats``.
+    Building a buffer upon a miss is charged to the ``ml_lib.memory``
+    budget, see ``get``.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2 ** 20):
+        """
+        :param max_bytes: Budget for the total size of cached buffers.
+        """
+        assert max_bytes >= 0, "max_bytes can't be negative!"
+        self.max_bytes: int = max_bytes
+        self._entries: Dict[Tuple[int, str], _Entry] = OrderedDict()
+        self.clear()
+
+    def get(
+        self, size: int, storage: str = "list", owner: Any = None
+    ) -> Sequence[int]:
+        """
+        :returns: A read-only buffer with ``range(size)`` in the given
+          storage, see ``ml_lib.storage.readonly``.
+        :param owner: Object charged for the buffer if it is too large to
+          be cached (e.g. the Bar that uses it). Cached buffers are charged
+          against their cache entry instead, so the charge is released
+          upon eviction.
+        :raises MemoryBudgetExceeded: If a budget was set with
+          ``ml_lib.memory.set_budget`` and a missing buffer doesn't fit in
+          it.
+        """
+        self._refresh()
+        key = (size, storage)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key].buf
+        self.misses += 1
+        entry = _Entry()
+        needed = estimate(size, storage)
+        charge(entry, needed)
+        entry.buf = readonly(materialize(range(size), storage, 0, size - 1))
+        entry.nbytes = nbytes(entry.buf)
+        if entry.nbytes <= self.max_bytes:
+            self._entries[key] = entry
+            self.nbytes += entry.nbytes
+            self._evict()
+            return entry.buf
+        buf = entry.buf
+        del entry  # releases its charge, which is moved to the owner
+        if owner is not None:
+            charge(owner, needed)
+        return buf
+
+    def _refresh(self) -> None:
+        """
+        Re-measure the paged entries, and evict entries if they grew beyond
+        ``max_bytes``.
+        """
+        for entry in self._entries.values():
+            if isinstance(entry.buf, PagedRange):
+                new_bytes = nbytes(entry.buf)
+                self.nbytes += new_bytes - entry.nbytes
+                entry.nbytes = new_bytes
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used entries until ``max_bytes`` is respected.
+        """
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drop all entries and reset the counters.
+        """
+        self._entries.clear()
+        self.nbytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        :returns: Counters of hits, misses and evictions, plus the current
+          number of entries and cached bytes.
+        """
+        self._refresh()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+        }
+
+
+BUFFER_CACHE = BufferCache()
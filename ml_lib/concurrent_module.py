@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module with thread-safe counterparts of Foo and Bar, whose ``loop`` can be
+called on the same instance from several threads at once. Each thread
+accumulates into its own shard of the result, so there are no lost updates
+and no shared counter to contend for (e.g. on free-threaded CPython).
+"""
+
+
+from typing import Dict, List
+import threading
+import weakref
+from .foo_module import Foo
+from .bar_module import Bar
+
+
+class _ThreadMark(object):
+    """
+    Held only by the thread-local storage of a ``ShardedCounter``, so it is
+    collected when its thread ends.
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+def _fold(counter_ref: "weakref.ref", shard: List[int]) -> None:
+    """
+    Move the shard of a finished thread into the base of its counter.
+    """
+    counter = counter_ref()
+    if counter is not None:
+        with counter._lock:
+            counter._base += shard[0]
+            del counter._shards[id(shard)]
+
+
+class ShardedCounter(object):
+    """
+    Integer counter split into one shard per thread. Each thread only
+    writes to its own shard, and ``total`` adds them all up. When a thread
+    ends, its shard is folded into a base count, so its count is kept but
+    the number of shards doesn't grow with the number of threads ever
+    used. Pickled counters keep the total only, in the shard of the
+    unpickling thread.
+    """
+
+    def __init__(self, value: int = 0):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._base: int = 0
+        self._shards: Dict[int, List[int]] = {}
+        self.set(value)
+
+    def _shard(self) -> List[int]:
+        """
+        :returns: The single-element list holding the calling thread's
+          shard, created upon first call from each thread.
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = [0]
+            with self._lock:
+                self._shards[id(shard)] = shard
+            self._local.shard = shard
+            self._local.mark = _ThreadMark()
+            weakref.finalize(
+                self._local.mark, _fold, weakref.ref(self), shard
+            )
+            return shard
+
+    def get(self) -> int:
+        """
+        :returns: The shard of the calling thread.
+        """
+        return self._shard()[0]
+
+    def set(self, value: int) -> None:
+        """
+        Set the shard of the calling thread.
+        """
+        self._shard()[0] = value
+
+    def total(self) -> int:
+        """
+        :returns: Sum of the base and all shards. Concurrent updates may or
+          may not be included, but are never lost.
+        """
+        with self._lock:
+            base = self._base
+            shards = list(self._shards.values())
+        return base + sum(shard[0] for shard in shards)
+
+    def reset(self) -> None:
+        """
+        Set the base and all shards to zero. Not to be called during
+        concurrent updates.
+        """
+        with self._lock:
+            self._base = 0
+            for shard in self._shards.values():
+                shard[0] = 0
+
+    def __getstate__(self):
+        return (self.total(),)
+
+    def __setstate__(self, state) -> None:
+        self.__init__(*state)
+
+
+class ConcurrentLoopMixin(object):
+    """
+    Replaces the ``_result`` attribute with the calling thread's shard of a
+    ``ShardedCounter``, and ``get_result`` with the total over all shards.
+    Without ``resume``, ``loop`` restarts all shards, as ``reset`` does, so
+    it must not overlap with other loops: concurrent callers should use
+    ``advance`` or ``resume`` instead.
+    Concrete classes must declare the ``_counter`` slot.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, *args, **kwargs):
+        """
+        The counter is created here, so it also exists for instances built
+        without ``__init__`` (e.g. by ``from_iterable`` or ``pickle``).
+        """
+        instance = super(ConcurrentLoopMixin, cls).__new__(cls)
+        instance._counter = ShardedCounter()
+        return instance
+
+    @property
+    def _result(self) -> int:
+        return self._counter.get()
+
+    @_result.setter
+    def _result(self, value: int) -> None:
+        self._counter.set(value)
+
+    def __getstate__(self):
+        """
+        See ``Foo.__getstate__``, except for ``_result``, which is already
+        held by ``_counter``.
+        """
+        attrs, slots = super(ConcurrentLoopMixin, self).__getstate__()
+        slots.pop("_result", None)
+        return (attrs, slots)
+
+    def reset(self) -> None:
+        """
+        Restart the result of all threads.
+        """
+        self._counter.reset()
+
+    def _restart(self) -> None:
+        """
+        See ``Foo._restart``. Restarts the result of all threads.
+        """
+        self.reset()
+
+    def restore(self, state) -> None:
+        """
+        See ``Foo.restore``. The restored result replaces all shards.
+        """
+        self.reset()
+        super(ConcurrentLoopMixin, self).restore(state)
+
+    def get_result(self) -> int:
+        """
+        :returns: The result, merged over all threads.
+        """
+        return self._counter.total()
+
+
+class ConcurrentFoo(ConcurrentLoopMixin, Foo):
+    """
+    Foo whose ``loop`` can be called concurrently from several threads.
+    """
+
+    __slots__ = ("_counter",)
+
+
+class ConcurrentBar(ConcurrentLoopMixin, Bar):
+    """
+    Bar whose ``loop`` can be called concurrently from several threads.
+    Mutating the data (e.g. ``extend``) is not thread-safe.
+    """
+
+    __slots__ = ("_counter",)
@@ -7,21 +7,68 @@ Module containing a simple class with low memory and runtime requirements.
 """
 
 
-from typing import Iterable
+from typing import Iterable, Iterator, Dict, Any, Tuple, Optional
+from functools import lru_cache
+import operator
+from time import monotonic
+from .parallel import LoopPool, get_pool
+from . import instrument
+from .memory import footprint
+from .backends import get_backend
+
+
+@lru_cache(maxsize=4096)
+def shared_range(size: int) -> range:
+    """
+    Flyweight pool of ``range(size)`` objects. Ranges are immutable, so
+    instances of the same size can share a single one.
+    """
+    return range(size)
+
+
+def iterations(times: int) -> int:
+    """
+    :returns: ``times`` as a number of iterations, like ``range`` takes it:
+      negative counts mean zero iterations.
+    :raises TypeError: If ``times`` is not an integer.
+    """
+    return max(0, operator.index(times))
 
 
 class Foo(object):
     """
-    A simple class with low memory and runtime requirements.
+    A simple class with low memory and runtime requirements. Attributes are
+    stored in ``__slots__``, so instances have no per-instance ``__dict__``.
+    Subclasses should declare ``__slots__`` for their own attributes to keep
+    this property (otherwise they just get a ``__dict__``, as usual).
     """
 
-    def __init__(self, size: int = 1000000):
+    __slots__ = ("_x", "_result", "_backend", "__weakref__")
+
+    def __init__(self, size: int = 1000000, backend: Optional[str] = None):
         """
         The instance will contain 2 small objects: 2*O(1) memory.
+
+        :param backend: Name of the compute backend that runs the loops, see
+          ``ml_lib.backends``. By default taken from the ``ML_LIB_BACKEND``
+          environment variable, or ``python`` if unset.
         """
         assert size > 0, "size has to be a positive int!"
-        self._x: Iterable[int] = range(size)
+        self._x: Iterable[int] = shared_range(size)
         self._result: int = 0
+        self._backend = get_backend(backend)
+
+    def set_backend(self, backend: Optional[str] = None) -> None:
+        """
+        Change the compute backend of this instance, see ``__init__``.
+        """
+        self._backend = get_backend(backend)
+
+    def _restart(self) -> None:
+        """
+        Restart the result, as done by ``loop`` without ``resume``.
+        """
+        self._result = 0
 
     def _computation(self) -> None:
         """
@@ -29,16 +76,282 @@ class Foo(object):
         """
         self._result += 1
 
-    def loop(self, times: int) -> None:
+    def _advance(self, n: int) -> None:
         """
-        Restart result and run computation a number of times.
+        Closed-form equivalent of running ``_computation`` ``n`` times, in
+        O(1). Subclasses that override ``_computation`` should also override
+        this if their aggregate effect over ``n`` steps is known, otherwise
+        ``loop`` falls back to calling ``_computation`` once per step.
+
+        :param n: non-negative number of steps.
+        :type n: int
+        """
+        self._result += n
+
+    def _provides(self, method: str) -> bool:
+        """
+        :returns: True if the most derived ``_computation`` is accompanied
+          by the given alternative ``method`` (e.g. ``_advance``), defined
+          at the same or a more derived class. Otherwise, a subclass changed
+          the computation and the alternative doesn't reflect it anymore.
+        """
+        for klass in type(self).__mro__:
+            if method in vars(klass):
+                return True
+            if "_computation" in vars(klass):
+                return False
+        return False
+
+    def _has_closed_form(self) -> bool:
+        """
+        :returns: True if ``_advance`` can be used, see ``_provides``.
+        """
+        return self._provides("_advance")
+
+    def _run(self, times: int) -> None:
+        """
+        Run the computation a number of times, without restarting the result,
+        using the backend of this instance.
 
         :param times: non-negative number.
         :type times: int
         """
-        self._result = 0
-        for i in range(times):
-            self._computation()
+        self._backend.run(self, times)
+
+    def _steps(self, times: int) -> None:
+        """
+        Pure Python implementation of ``_run``. Dispatches to ``_advance``
+        if available, see ``_has_closed_form``.
+
+        :param times: non-negative number.
+        :type times: int
+        """
+        if self._has_closed_form():
+            self._advance(times)
+        else:
+            for i in range(times):
+                self._computation()
+
+    def loop(
+        self,
+        times: int,
+        workers: int = 1,
+        resume: bool = False,
+        deadline: Optional[float] = None,
+        max_seconds: Optional[float] = None,
+        check_every: Optional[int] = None,
+    ) -> int:
+        """
+        Restart result and run computation a number of times.
+
+        :param times: number of iterations, see ``iterations``.
+        :type times: int
+        :param workers: If greater than 1, the iterations are split across
+          a pool with this many processes, and the partial results are added
+          up. The pool is kept for later calls with the same ``workers``,
+          see ``ml_lib.parallel.get_pool``. Loops with a closed form run in
+          the current process.
+        :type workers: int
+        :param resume: If true, the result is not restarted and the
+          computation continues from the current state.
+        :type resume: bool
+        :param deadline: Optional ``time.monotonic()`` value. If given, the
+          loop stops at the first check past it, possibly before ``times``
+          iterations, and the result reflects the iterations completed.
+        :type deadline: float
+        :param max_seconds: Like ``deadline``, but relative to the start
+          of the call. If both are given, the earliest applies.
+        :type max_seconds: float
+        :param check_every: Iterations between checks of the time budget.
+          By default, it starts at 1 and adapts to the measured speed, so
+          that checks are rare for fast computations and a check never
+          overshoots the remaining budget by much.
+        :type check_every: int
+        :returns: The number of iterations completed.
+        :rtype: int
+        """
+        assert check_every is None or check_every > 0, "check_every > 0!"
+        times = iterations(times)
+        token = None
+        if instrument.ENABLED:  # only a flag check if no hooks registered
+            token = instrument.loop_start(self, times)
+        if max_seconds is not None:
+            end = monotonic() + max_seconds
+            deadline = end if deadline is None else min(deadline, end)
+        if not resume:
+            self._restart()
+        if workers > 1 and not self._has_closed_form():
+            pool = get_pool(self, workers)
+            done = self._run_until(times, deadline, check_every, pool)
+        elif deadline is None:
+            self._run(times)
+            done = times
+        else:
+            with self._backend.session(self):
+                done = self._run_until(times, deadline, check_every)
+        if token is not None:
+            instrument.loop_end(token, done)
+        return done
+
+    def _run_until(
+        self,
+        times: int,
+        deadline: Optional[float],
+        check_every: Optional[int],
+        pool: Optional[LoopPool] = None,
+    ) -> int:
+        """
+        Run up to ``times`` iterations in chunks, checking the ``deadline``
+        (if any) after each chunk, see ``loop``. Chunks are run by the
+        backend of this instance, or by ``pool`` if given.
+
+        :returns: The number of iterations completed.
+        """
+        if deadline is None:
+            check_every = times
+        chunk = check_every or 1
+        done = 0
+        while done < times:
+            n = min(chunk, times - done)
+            t0 = monotonic()
+            if pool is None:
+                self._run(n)
+            else:
+                self._result += pool.run(n)
+            done += n
+            t1 = monotonic()
+            if deadline is None or t1 >= deadline:
+                break
+            if check_every is None:
+                # grow geometrically, but aim at a fraction of the time left
+                per_iteration = (t1 - t0) / n
+                chunk = 2 * n
+                if per_iteration > 0:
+                    fits = int((deadline - t1) / (4 * per_iteration))
+                    chunk = max(1, min(chunk, fits))
+        return done
+
+    def iter_loop(
+        self, times: int, every: int = 1, resume: bool = False
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Generator version of ``loop``, that runs the computation in chunks
+        of ``every`` iterations and yields the progress after each chunk.
+        The consumer can stop early by breaking out of the iteration. Once
+        exhausted, the state is the same as after ``loop(times, resume)``.
+
+        :param times: number of iterations, see ``iterations``.
+        :param every: Iterations between snapshots.
+        :param resume: If true, continue from the current result.
+        :returns: ``(iterations_done, result)`` tuples, the last one being
+          ``(times, get_result())``.
+        """
+        assert every > 0, "every has to be a positive int!"
+        times = iterations(times)
+        if not resume:
+            self._restart()
+        done = 0
+        with self._backend.session(self):
+            while True:
+                chunk = min(every, times - done)
+                self._run(chunk)
+                done += chunk
+                yield (done, self.get_result())
+                if done >= times:
+                    break
+
+    def advance(self, times: int, workers: int = 1) -> int:
+        """
+        Continue the computation for a number of times, without restarting.
+        Equivalent to ``loop(times, workers, resume=True)``.
+        """
+        return self.loop(times, workers, resume=True)
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """
+        :returns: A small, picklable and JSON-serializable snapshot of the
+          loop state, that can be passed to ``restore`` on an equivalent
+          instance (possibly in another process).
+        """
+        return {
+            "class": type(self).__module__ + "." + type(self).__qualname__,
+            "size": len(self._x),
+            "result": self.get_result(),
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """
+        Set the loop state from a ``checkpoint``.
+
+        :raises ValueError: If the checkpoint was taken from an instance of
+          a different class or size.
+        """
+        expected = self.checkpoint()
+        for key in ("class", "size"):
+            if state[key] != expected[key]:
+                raise ValueError(
+                    "Checkpoint {} mismatch: {} != {}".format(
+                        key, state[key], expected[key]
+                    )
+                )
+        self._result = state["result"]
+
+    def __getstate__(self):
+        """
+        Pickling state: the ``__dict__`` of subclasses without ``__slots__``
+        (None otherwise), and a dict with the value of each slot. Needed by
+        pickling protocols 0 and 1, which don't support slots by default.
+        """
+        slots = {}
+        for klass in type(self).__mro__:
+            for name in vars(klass).get("__slots__", ()):
+                if name != "__weakref__" and hasattr(self, name):
+                    slots[name] = getattr(self, name)
+        return (getattr(self, "__dict__", None) or None, slots)
+
+    def __setstate__(self, state) -> None:
+        """
+        Restore the state returned by ``__getstate__``.
+        """
+        attrs, slots = state
+        if attrs:
+            self.__dict__.update(attrs)
+        for name, value in slots.items():
+            setattr(self, name, value)
+
+    def save(self, path: str) -> None:
+        """
+        Write the state of this instance to ``path`` in a versioned binary
+        format, see ``ml_lib.snapshot``. Restore it with ``load``.
+        """
+        from . import snapshot
+
+        snapshot.write(path, self)
+
+    @classmethod
+    def load(cls, path: str, backend: Optional[str] = None):
+        """
+        :returns: A new instance with the state written by ``save``.
+        :param backend: See ``__init__``.
+        :raises ValueError: If the file is corrupted, was written by an
+          incompatible version or platform, or holds the state of a
+          different class.
+        """
+        from . import snapshot
+
+        header = snapshot.read_header(path, cls)
+        foo = cls.__new__(cls)
+        foo._x = shared_range(header.size)
+        foo._result = header.result
+        foo._backend = get_backend(backend)
+        return foo
+
+    def memory_footprint(self) -> int:
+        """
+        :returns: Bytes held by this instance, including its containers and
+          their elements. See ``ml_lib.memory.footprint``.
+        """
+        return footprint(self)
 
     def get_result(self) -> int:
         """
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module with a registry of instrumentation hooks around ``Foo.loop`` (and
+therefore around the ``_computation`` of any subclass). While no hooks are
+registered, ``ENABLED`` is false and ``loop`` skips all of this module,
+paying a single global flag check.
+
+Usage example::
+
+  records = []
+  hook = register(on_loop_end=records.append, sample_every=100)
+  ...
+  unregister(hook)
+"""
+
+
+from typing import Callable, List, Optional, NamedTuple, Tuple, Any
+import time
+
+
+class LoopRecord(NamedTuple):
+    """
+    Measurement of a single ``loop`` call, passed to ``on_loop_end``.
+    """
+
+    cls: type
+    iterations: int
+    seconds: float
+
+
+class Hook(object):
+    """
+    Handle returned by ``register``. Calls are sampled independently for
+    each hook: only every ``sample_every``-th loop call is reported.
+    """
+
+    def __init__(
+        self,
+        on_loop_start: Optional[Callable[[Any, int], None]] = None,
+        on_loop_end: Optional[Callable[[LoopRecord], None]] = None,
+        sample_every: int = 1,
+    ):
+        assert sample_every > 0, "sample_every has to be a positive int!"
+        self.on_loop_start = on_loop_start
+        self.on_loop_end = on_loop_end
+        self.sample_every: int = sample_every
+        self.calls: int = 0
+
+
+_HOOKS: List[Hook] = []
+ENABLED: bool = False
+
+
+def register(
+    on_loop_start: Optional[Callable[[Any, int], None]] = None,
+    on_loop_end: Optional[Callable[[LoopRecord], None]] = None,
+    sample_every: int = 1,
+) -> Hook:
+    """
+    :param on_loop_start: Called as ``on_loop_start(instance, times)``
+      before a sampled loop starts.
+    :param on_loop_end: Called with a ``LoopRecord`` after a sampled loop
+      finishes. Loops interrupted by an exception are not reported.
+    :param sample_every: Report only one out of this many loop calls.
+    :returns: A handle that can be passed to ``unregister``.
+    """
+    global ENABLED
+    hook = Hook(on_loop_start, on_loop_end, sample_every)
+    _HOOKS.append(hook)
+    ENABLED = True
+    return hook
+
+
+def unregister(hook: Hook) -> None:
+    """
+    Remove a hook returned by ``register``.
+    """
+    global ENABLED
+    _HOOKS.remove(hook)
+    ENABLED = bool(_HOOKS)
+
+
+def clear() -> None:
+    """
+    Remove all hooks, restoring the no-op path.
+    """
+    global ENABLED
+    del _HOOKS[:]
+    ENABLED = False
+
+
+def loop_start(instance, times: int) -> Optional[Tuple]:
+    """
+    Called by ``loop`` when ``ENABLED``.
+
+    :returns: ``None`` if no hook sampled this call, otherwise a token that
+      has to be passed to ``loop_end``.
+    """
+    sampled = []
+    for hook in _HOOKS:
+        hook.calls += 1
+        if hook.calls % hook.sample_every == 0:
+            sampled.append(hook)
+            if hook.on_loop_start is not None:
+                hook.on_loop_start(instance, times)
+    if not sampled:
+        return None
+    return (sampled, type(instance), time.perf_counter())
+
+
+def loop_end(token: Tuple, iterations: int) -> None:
+    """
+    Called by ``loop`` with the token returned by ``loop_start``.
+
+    :param iterations: Number of computations actually performed.
+    """
+    sampled, cls, t0 = token
+    record = LoopRecord(cls, iterations, time.perf_counter() - t0)
+    for hook in sampled:
+        if hook.on_loop_end is not None:
+            hook.on_loop_end(record)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module with optional, JIT-compiled kernels for the hot loops. They require
+Numba (and therefore NumPy), and are compiled upon first use. If Numba is
+not installed, ``HAS_NUMBA`` is false and the ``jit`` backend transparently
+falls back to the pure Python path.
+"""
+
+
+from typing import Callable
+from importlib.util import find_spec
+
+
+HAS_NUMBA: bool = find_spec("numba") is not None
+
+# compiled kernels, by name
+_KERNELS = {}
+
+
+def _bar_loop(x, value: int, times: int) -> bool:
+    """
+    Native version of ``times`` iterations of the ``Bar._computation``
+    lookup: a linear scan of ``x`` for ``value``.
+
+    :returns: True if ``value`` was found. Since ``x`` doesn't change during
+      the loop, either all lookups succeed or the first one fails.
+    """
+    for _ in range(times):
+        found = False
+        for i in range(x.shape[0]):
+            if x[i] == value:
+                found = True
+                break
+        if not found:
+            return False
+    return True
+
+
+def get_kernel(name: str) -> Callable:
+    """
+    :param name: Name of a kernel function of this module, e.g.
+      ``_bar_loop``.
+    :returns: The JIT-compiled kernel, compiled on first request.
+    :raises ImportError: If Numba is not installed.
+    """
+    if name not in _KERNELS:
+        import numba
+
+        _KERNELS[name] = numba.njit(cache=False, nogil=True)(globals()[name])
+    return _KERNELS[name]
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module for memory accounting: measurement of the bytes held by an instance,
+and an optional process-wide budget that makes the construction of new
+Bars fail fast, instead of the process being killed when out of memory.
+"""
+
+
+from typing import Optional, Set, Any
+import sys
+import weakref
+from array import array
+from .storage import is_ndarray, narrowest_typecode
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """
+    Raised when an allocation would exceed the budget set via ``set_budget``.
+    """
+
+    pass
+
+
+# ##############################################################################
+# # MEASUREMENT
+# ##############################################################################
+def sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    :returns: Bytes of ``obj``, recursing into builtin containers, the
+      exporters of memoryviews and the bases of NumPy views. Objects already
+      in ``seen`` (by id) are not counted again. Memory-mapped pages are
+      not counted, since they are backed by a file and not by the process.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(sizeof(elt, seen) for elt in obj)
+    elif isinstance(obj, dict):
+        size += sum(sizeof(k, seen) + sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, memoryview):
+        size += sizeof(obj.obj, seen)
+    elif is_ndarray(obj):
+        if obj.base is not None:
+            size += sizeof(obj.base, seen)
+    return size
+
+
+def footprint(instance: Any) -> int:
+    """
+    :returns: Bytes held by ``instance``: the object itself, its attribute
+      dict and slots (if any), and every attribute value measured with
+      ``sizeof``.
+    """
+    seen = {id(instance)}
+    size = sys.getsizeof(instance)
+    values = []
+    if hasattr(instance, "__dict__"):
+        seen.add(id(instance.__dict__))
+        size += sys.getsizeof(instance.__dict__)
+        values.extend(instance.__dict__.values())
+    for klass in type(instance).__mro__:
+        slots = vars(klass).get("__slots__", ())
+        for name in [slots] if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__"):
+                if hasattr(instance, name):
+                    values.append(getattr(instance, name))
+    for value in values:
+        size += sizeof(value, seen)
+    return size
+
+
+def estimate(size: int, storage: str, lo: int = 0, hi: int = None) -> int:
+    """
+    :returns: Approximate bytes that materializing ``size`` integers in
+      ``[lo, hi]`` with the given storage will take, before doing it. Zero
+      for the ``paged`` storage, whose pages are charged one by one as they
+      are materialized, see ``ml_lib.storage.PagedRange``.
+    """
+    if storage == "paged":
+        return 0
+    if hi is None:
+        hi = size - 1
+    if storage == "list":
+        return sys.getsizeof([]) + size * (8 + sys.getsizeof(hi))
+    return size * array(narrowest_typecode(lo, hi)).itemsize
+
+
+# ##############################################################################
+# # BUDGET
+# ##############################################################################
+_BUDGET: Optional[int] = None
+_USED: int = 0
+
+
+def set_budget(max_bytes: Optional[int]) -> None:
+    """
+    :param max_bytes: Total bytes that the instances charged via ``charge``
+      may hold at once. ``None`` disables the budget.
+    """
+    global _BUDGET
+    assert max_bytes is None or max_bytes >= 0, "Negative budget!"
+    _BUDGET = max_bytes
+
+
+def used() -> int:
+    """
+    :returns: Bytes currently charged to the budget by live instances.
+    """
+    return _USED
+
+
+def _release(nbytes: int) -> None:
+    global _USED
+    _USED -= nbytes
+
+
+def charge(instance: Any, nbytes: int) -> None:
+    """
+    Charge ``nbytes`` to the budget until ``instance`` is garbage collected.
+    Call it before allocating, so the allocation can be prevented.
+
+    :raises MemoryBudgetExceeded: if the budget would be exceeded.
+    """
+    global _USED
+    if _BUDGET is None:
+        return
+    if _USED + nbytes > _BUDGET:
+        raise MemoryBudgetExceeded(
+            "{} needs {} bytes, but only {} of the {} budgeted are free".format(
+                type(instance).__name__, nbytes, _BUDGET - _USED, _BUDGET
+            )
+        )
+    _USED += nbytes
+    weakref.finalize(instance, _release, nbytes)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module with a Bar variant whose data lives in a file-backed memory map,
+so it doesn't need to be resident in RAM and can be shared across
+processes through the OS page cache.
+"""
+
+
+from typing import Optional
+import os
+import mmap
+import tempfile
+import weakref
+from array import array
+from .bar_module import Bar
+from .storage import narrowest_typecode, typed_views, release_views
+from .backends import get_backend
+
+
+class MmapBar(Bar):
+    """
+    Like Bar, but ``_x`` is a typed ``memoryview`` over a memory-mapped file.
+    Pages are loaded lazily by the OS, so opening a file is O(1) and memory
+    usage is bounded by the pages actually touched.
+    Call ``close`` (or use as a context manager) to release the mapping.
+    """
+
+    # number of elements written to disk at once when creating a file
+    CHUNK_SIZE: int = 1 << 20
+    # snapshots written by ``save`` hold a copy of the data, loaded with
+    # ``Bar.load``
+    SNAPSHOT_CLASS = Bar
+
+    def __init__(
+        self,
+        size: int = 1000000,
+        path: Optional[str] = None,
+        typecode: Optional[str] = None,
+    ):
+        """
+        Writes ``range(size)`` to ``path`` and maps it. O(1) memory.
+
+        :param path: Destination file, overwritten if existing. If not
+          given, a temporary file is used and removed upon ``close``.
+        :param typecode: ``array`` typecode for the elements. By default the
+          narrowest one that fits ``size``.
+        """
+        super(Bar, self).__init__(size)
+        if typecode is None:
+            typecode = narrowest_typecode(0, size - 1)
+        remove = path is None
+        if remove:
+            fd, path = tempfile.mkstemp(suffix=".bar")
+            os.close(fd)
+        with open(path, "wb") as f:
+            for beg in range(0, size, self.CHUNK_SIZE):
+                chunk = range(beg, min(beg + self.CHUNK_SIZE, size))
+                array(typecode, chunk).tofile(f)
+        self._map(path, typecode, 0, False, remove)
+
+    @classmethod
+    def open(
+        cls,
+        path: str,
+        typecode: str = "q",
+        offset: int = 0,
+        writable: bool = False,
+    ):
+        """
+        Map an existing file with raw, native-endian integers, without
+        reading or copying its contents.
+
+        :param typecode: ``array`` typecode of the stored elements.
+        :param offset: Number of bytes to skip at the start of the file.
+        :param writable: If true, changes to ``_x`` are written to the file.
+        """
+        bar = cls.__new__(cls)
+        bar._result = 0
+        bar._backend = get_backend()
+        bar._map(path, typecode, offset, writable, False)
+        return bar
+
+    def _map(
+        self,
+        path: str,
+        typecode: str,
+        offset: int,
+        writable: bool,
+        remove: bool,
+    ) -> None:
+        """
+        Map ``path`` into ``self._x``. If ``remove`` is true, the file is
+        deleted when the mapping is closed or the instance is collected.
+        """
+        self._storage: str = "mmap"
+        self._index = None
+        self._shared = False
+        self._path: str = path
+        with open(path, "r+b" if writable else "rb") as f:
+            self._mmap = mmap.mmap(
+                f.fileno(),
+                0,
+                access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ,
+            )
+        itemsize = array(typecode).itemsize
+        length = (len(self._mmap) - offset) // itemsize
+        assert length > 0, "No elements found in {}".format(path)
+        self._views = typed_views(
+            self._mmap, offset, length * itemsize, typecode
+        )
+        self._x = self._views[-1]
+        self._finalizer = weakref.finalize(
+            self, self._unmap, self._mmap, self._views, path if remove else None
+        )
+
+    @staticmethod
+    def _unmap(mm: mmap.mmap, views, remove_path: Optional[str]) -> None:
+        """
+        Release all views and the map, and optionally remove the file.
+        """
+        release_views(views)
+        mm.close()
+        if remove_path is not None:
+            os.remove(remove_path)
+
+    def close(self) -> None:
+        """
+        Release the mapping. The instance can't be used afterwards.
+        """
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @classmethod
+    def from_iterable(cls, data, storage: str = "mmap"):
+        """
+        Memory-mapped data is created from a range or opened from a file.
+        """
+        raise TypeError("Use MmapBar(size) or MmapBar.open(path)")
+
+    @classmethod
+    def load(cls, path: str, *args, **kwargs):
+        """
+        Snapshots are loaded as plain ``Bar`` instances.
+        """
+        raise TypeError("Use MmapBar.open or Bar.load")
+
+    def extend(self, values) -> None:
+        """
+        Memory-mapped data has a fixed size.
+        """
+        raise TypeError("MmapBar can't be extended")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module with a columnar container for many Baz-shaped records.
+"""
+
+
+from typing import Dict, Iterable, List, Any, Sequence
+import operator
+from array import array
+from .baz_module import Baz
+from ..storage import HAS_NUMPY, extend, narrowest_typecode
+
+
+# Baz fields, in declaration order, with their default values
+FIELDS = tuple(Baz.__annotations__)
+DEFAULTS = {name: getattr(Baz, name) for name in FIELDS}
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    ">": operator.gt,
+}
+
+
+class BazRow(object):
+    """
+    Lightweight, read-only view of a single row of a ``BazTable``.
+    """
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "BazTable", row: int):
+        self._table = table
+        self._row = row
+
+    def __getattr__(self, name: str) -> int:
+        if name not in DEFAULTS:
+            raise AttributeError(name)
+        return self._table._columns[name][self._row]
+
+    def __repr__(self) -> str:
+        return "BazRow({})".format(
+            ", ".join("{}={}".format(k, getattr(self, k)) for k in FIELDS)
+        )
+
+
+class BazTable(object):
+    """
+    Stores each Baz field as a contiguous ``array.array`` column, so each
+    record takes ``len(FIELDS)`` times the integer width, which is
+    automatically widened as larger values are appended. If NumPy is
+    installed, reductions and filters are vectorized over the columns.
+    """
+
+    def __init__(self):
+        self._columns: Dict[str, array] = {
+            name: array(narrowest_typecode(value, value))
+            for name, value in DEFAULTS.items()
+        }
+        self._len: int = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, row: int) -> BazRow:
+        if row < 0:
+            row += self._len
+        if not 0 <= row < self._len:
+            raise IndexError("BazTable index out of range")
+        return BazRow(self, row)
+
+    def extend_columns(self, **columns: Sequence[int]) -> None:
+        """
+        Bulk append of records given column-wise. All given columns must have
+        the same length, and missing fields take the ``Baz`` defaults. The
+        table is only modified once all the values have been converted, so
+        it is left unchanged if any of them is invalid.
+        """
+        lengths = {len(col) for col in columns.values()}
+        assert len(lengths) <= 1, "Columns must have the same length!"
+        unknown = set(columns) - set(FIELDS)
+        assert not unknown, "Unknown fields: {}".format(sorted(unknown))
+        n = lengths.pop() if lengths else 0
+        tails = {}
+        for name in FIELDS:
+            values = list(columns.get(name, [DEFAULTS[name]] * n))
+            empty = array(self._columns[name].typecode)
+            tails[name] = extend(empty, values, "array")
+        for name, tail in tails.items():
+            self._columns[name] = self._concatenate(self._columns[name], tail)
+        self._len += n
+
+    @staticmethod
+    def _concatenate(col: array, tail: array) -> array:
+        """
+        :returns: ``col`` followed by ``tail``, with the wider typecode of
+          both. ``col`` is extended in place, unless it has to be widened or
+          is exported (e.g. by a ``column`` view), in which case a new array
+          is returned and ``col`` is left untouched.
+        """
+        if tail.itemsize > col.itemsize:
+            col = array(tail.typecode, col)
+        elif tail.typecode != col.typecode:
+            tail = array(col.typecode, tail)
+        try:
+            col.extend(tail)
+        except BufferError:
+            col = col + tail
+        return col
+
+    def extend(self, records: Iterable[Any]) -> None:
+        """
+        Bulk append of records given row-wise, as ``Baz``-like objects or
+        as mappings (missing keys take the ``Baz`` defaults).
+        """
+        columns: Dict[str, List[int]] = {name: [] for name in FIELDS}
+        for record in records:
+            for name, col in columns.items():
+                if isinstance(record, dict):
+                    col.append(record.get(name, DEFAULTS[name]))
+                else:
+                    col.append(getattr(record, name))
+        self.extend_columns(**columns)
+
+    def append(self, record: Any = None, **values: int) -> None:
+        """
+        Append a single record, either a ``Baz``-like object or given as
+        keyword arguments.
+        """
+        self.extend([values if record is None else record])
+
+    def column(self, name: str):
+        """
+        :returns: The column of field ``name``. If NumPy is installed, this
+          is a zero-copy, read-only ``ndarray`` view, otherwise a copy of
+          the ``array``. Either way, it is a snapshot: rows appended
+          afterwards are not reflected (while a view is alive, appends
+          reallocate the column instead of extending it in place).
+        """
+        col = self._columns[name]
+        if HAS_NUMPY:
+            import numpy
+
+            view = numpy.frombuffer(col, dtype=col.typecode)
+            view.flags.writeable = False
+            return view
+        return array(col.typecode, col)
+
+    def reduce(self, name: str, how: str = "sum") -> int:
+        """
+        :param how: One of ``sum``, ``min`` or ``max``.
+        :returns: The reduction of column ``name``.
+        """
+        assert how in ("sum", "min", "max"), "Unknown reduction: " + how
+        col = self.column(name)
+        if HAS_NUMPY:
+            return int(getattr(col, how)())
+        return {"sum": sum, "min": min, "max": max}[how](col)
+
+    def where(self, name: str, op: str, value: int) -> List[int]:
+        """
+        :param op: Comparison operator, one of ``OPERATORS``.
+        :returns: Indices of the rows where ``column(name) op value``.
+        """
+        compare = OPERATORS[op]
+        col = self.column(name)
+        if HAS_NUMPY:
+            return compare(col, value).nonzero()[0].tolist()
+        return [i for i, v in enumerate(col) if compare(v, value)]
+
+    def memory_footprint(self) -> int:
+        """
+        :returns: Bytes held by the column buffers.
+        """
+        return sum(col.itemsize * len(col) for col in self._columns.values())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module to split a ``loop`` across a pool of worker processes. Each worker
+receives a copy of the instance once, when the pool starts, and reuses it
+for every chunk of iterations submitted afterwards.
+"""
+
+
+from typing import Dict, List, Tuple
+import threading
+import weakref
+
+
+# copy of the instance held by each worker process
+_WORKER_INSTANCE = None
+# pools kept by ``get_pool``: id(instance) -> {workers: (data key, pool)}
+_POOLS: Dict[int, Dict[int, Tuple[Tuple[int, int], "LoopPool"]]] = {}
+_POOLS_LOCK = threading.RLock()  # finalizers may run during get_pool
+
+
+def _init_worker(instance) -> None:
+    """
+    Pool initializer: store the instance copy for this worker.
+    """
+    global _WORKER_INSTANCE
+    _WORKER_INSTANCE = instance
+
+
+def _run_chunk(times: int) -> int:
+    """
+    Run ``times`` iterations on this worker's instance copy.
+
+    :returns: The partial result of those iterations only.
+    """
+    _WORKER_INSTANCE._result = 0
+    _WORKER_INSTANCE._steps(times)  # python backend, to avoid nested pools
+    return _WORKER_INSTANCE._result
+
+
+def split(times: int, parts: int) -> List[int]:
+    """
+    :returns: ``parts`` non-negative integers, as equal as possible, that
+      add up to ``times``.
+    """
+    q, r = divmod(times, parts)
+    return [q + 1] * r + [q] * (parts - r)
+
+
+class LoopPool(object):
+    """
+    A process pool bound to a ``Foo`` (or subclass) instance. The instance is
+    copied into the workers when the pool is created, so later changes to
+    it are not seen by the workers. Use as a context manager, or call
+    ``close`` when done.
+    """
+
+    def __init__(self, instance, workers: int):
+        """
+        :param instance: A ``Foo``-like object. It must be picklable unless
+          the ``fork`` start method is used.
+        :param workers: Number of worker processes.
+        """
+        # imported here, since it pulls in multiprocessing at import time
+        from concurrent.futures import ProcessPoolExecutor
+
+        assert workers > 0, "workers has to be a positive int!"
+        self.instance = instance
+        self.workers: int = workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(instance,),
+        )
+
+    def run(self, times: int) -> int:
+        """
+        Run ``times`` iterations split across the workers.
+
+        :returns: The combined result, i.e. the sum of the partial results.
+        """
+        chunks = [c for c in split(times, self.workers) if c > 0]
+        return sum(self._executor.map(_run_chunk, chunks))
+
+    def loop(self, times: int) -> None:
+        """
+        Parallel equivalent of ``instance.loop(times)``.
+        """
+        self.instance._result = self.run(times)
+
+    def close(self) -> None:
+        """
+        Shut down the worker processes.
+        """
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def _detached(instance):
+    """
+    :returns: A shallow copy of ``instance``, sharing its data, so that a
+      pool can hold it without keeping ``instance`` alive.
+    """
+    clone = type(instance).__new__(type(instance))
+    clone.__setstate__(instance.__getstate__())
+    return clone
+
+
+def _close_pools(key: int) -> None:
+    """
+    Close the pools kept by ``get_pool`` for a collected instance.
+    """
+    with _POOLS_LOCK:
+        pools = _POOLS.pop(key, {})
+    for _, pool in pools.values():
+        pool.close()
+
+
+def get_pool(instance, workers: int) -> LoopPool:
+    """
+    :returns: A pool of ``workers`` processes for ``instance``, started
+      upon the first call and reused by the following ones, as long as the
+      data of ``instance`` is the same (same ``_x`` object and length).
+      Otherwise a new pool replaces it. Pools are closed once ``instance``
+      is collected. Changes to other attributes are not seen by the
+      workers.
+    """
+    key = id(instance)
+    data_key = (id(instance._x), len(instance._x))
+    stale = None
+    with _POOLS_LOCK:
+        pools = _POOLS.get(key)
+        if pools is None:
+            pools = _POOLS[key] = {}
+            weakref.finalize(instance, _close_pools, key)
+        entry = pools.get(workers)
+        if entry is None or entry[0] != data_key:
+            stale = entry
+            entry = pools[workers] = (
+                data_key,
+                LoopPool(_detached(instance), workers),
+            )
+    if stale is not None:
+        stale[1].close()
+    return entry[1]
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module with a Bar variant whose data lives in a
+``multiprocessing.shared_memory`` block, so that several processes can read
+the same data without pickling or copying it.
+
+Ownership is explicit: the instance returned by ``SharedBar.publish`` owns
+the block, and unlinks it upon ``close`` (or when garbage collected).
+Instances returned by ``SharedBar.attach`` only detach from it. A block
+stays alive while any process has it attached, even if already unlinked.
+"""
+
+
+from typing import Optional
+import os
+import sys
+import struct
+import mmap
+import weakref
+from array import array
+from multiprocessing import shared_memory, resource_tracker
+from .bar_module import Bar
+from .backends import get_backend
+from .storage import packed, typecode_of, typed_views, release_views
+
+
+def _tracker_id() -> int:
+    """
+    :returns: An identifier of the ``multiprocessing`` resource tracker used
+      by this process (the inode of the pipe to it), which is the same for
+      all processes sharing the tracker, e.g. a parent and its children.
+      Zero if there is none (e.g. on Windows).
+    """
+    fd = getattr(resource_tracker._resource_tracker, "_fd", None)
+    return 0 if fd is None else os.fstat(fd).st_ino
+
+
+class SharedBar(Bar):
+    """
+    Like Bar, but ``_x`` is a read-only, typed ``memoryview`` over a shared
+    memory block. The block starts with a small header (magic, typecode and
+    number of elements), so attaching only requires its name. Pickling a
+    SharedBar transfers only the block name, and unpickling attaches to it.
+    """
+
+    # magic, typecode, padding, length, resource tracker of the owner
+    HEADER = struct.Struct("=4sc3xqQ")
+    MAGIC = b"MLSB"
+    # snapshots written by ``save`` hold a copy of the data, loaded with
+    # ``Bar.load``
+    SNAPSHOT_CLASS = Bar
+
+    @classmethod
+    def publish(cls, bar: Bar, name: Optional[str] = None) -> "SharedBar":
+        """
+        Copy the data of ``bar`` into a new shared memory block.
+
+        :param name: Name of the block. Random if not given.
+        :returns: A new instance that owns the block, with the same result
+          and backend as ``bar``.
+        """
+        x = packed(bar._x)
+        typecode = typecode_of(x)
+        itemsize = array(typecode).itemsize
+        shm = shared_memory.SharedMemory(
+            name, create=True, size=cls.HEADER.size + len(x) * itemsize
+        )
+        cls.HEADER.pack_into(
+            shm.buf, 0, cls.MAGIC, typecode.encode(), len(x), _tracker_id()
+        )
+        with memoryview(x) as src, src.cast("B") as src_bytes:
+            shm.buf[cls.HEADER.size : cls.HEADER.size + src_bytes.nbytes] = (
+                src_bytes
+            )
+        shared = cls.__new__(cls)
+        shared._result = bar._result
+        shared._backend = bar._backend
+        shared._setup(shm, owner=True)
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, result: int = 0) -> "SharedBar":
+        """
+        Attach to an existing block created by ``publish``, without copying.
+
+        :raises FileNotFoundError: If there is no block with that name.
+        :raises ValueError: If the block wasn't created by ``publish``.
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name, track=False)
+        elif not shared_memory._USE_POSIX:  # no resource tracker
+            shm = shared_memory.SharedMemory(name)
+        else:
+            # this registers the block with the resource tracker of this
+            # process, which would unlink it upon exit. Only the owner
+            # should, so the header is checked before, and the registration
+            # is undone unless the tracker is the owner's too (then it is
+            # the owner's registration).
+            header = cls._read_header(name)
+            if header is None:
+                raise ValueError("{} is not a SharedBar block".format(name))
+            shm = shared_memory.SharedMemory(name)
+            if header[-1] != _tracker_id():
+                resource_tracker.unregister(shm._name, "shared_memory")
+        shared = cls.__new__(cls)
+        shared._result = result
+        shared._backend = get_backend()
+        shared._setup(shm, owner=False)
+        return shared
+
+    def _setup(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        """
+        Expose the data of ``shm`` as ``self._x`` and register its cleanup.
+        """
+        if not self._is_block(shm):
+            shm.close()
+            raise ValueError("{} is not a SharedBar block".format(shm.name))
+        _, typecode, length, _ = self.HEADER.unpack_from(shm.buf, 0)
+        typecode = typecode.decode()
+        nbytes = length * array(typecode).itemsize
+        self._storage = "shm"
+        self._shared = False
+        self._index = None
+        self._shm = shm
+        self.owner: bool = owner
+        self._views = typed_views(
+            shm.buf, self.HEADER.size, nbytes, typecode, readonly=True
+        )
+        self._x = self._views[-1]
+        self._finalizer = weakref.finalize(
+            self, self._cleanup, shm, self._views, owner
+        )
+
+    @classmethod
+    def _read_header(cls, name: str) -> Optional[tuple]:
+        """
+        Read the header of block ``name`` without ``SharedMemory``, which
+        registers the block with the resource tracker before Python 3.13.
+        POSIX only.
+
+        :returns: The unpacked header, or None if the block wasn't created
+          by ``publish``.
+        :raises FileNotFoundError: If there is no block with that name.
+        """
+        import _posixshmem
+
+        fd = _posixshmem.shm_open("/" + name, os.O_RDONLY)
+        try:
+            if os.fstat(fd).st_size < cls.HEADER.size:
+                return None
+            with mmap.mmap(
+                fd, cls.HEADER.size, access=mmap.ACCESS_READ
+            ) as head:
+                header = cls.HEADER.unpack(head)
+        finally:
+            os.close(fd)
+        return header if header[0] == cls.MAGIC else None
+
+    @classmethod
+    def _is_block(cls, shm: shared_memory.SharedMemory) -> bool:
+        """
+        :returns: True if ``shm`` starts with a header written by ``publish``.
+        """
+        return (
+            shm.size >= cls.HEADER.size
+            and shm.buf[: len(cls.MAGIC)] == cls.MAGIC
+        )
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the shared memory block, to be passed to ``attach``.
+        """
+        return self._shm.name
+
+    @staticmethod
+    def _cleanup(shm: shared_memory.SharedMemory, views, owner: bool) -> None:
+        """
+        Release the views and detach from the block. The owner also unlinks
+        it, so no new process can attach.
+        """
+        release_views(views)
+        shm.close()
+        if owner:
+            shm.unlink()
+
+    def close(self) -> None:
+        """
+        Detach from the block, and unlink it if this instance is the owner.
+        The instance can't be used afterwards.
+        """
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __reduce_ex__(self, protocol: int):
+        """
+        Pickle by name: the receiving process attaches to the same block.
+        """
+        return (type(self).attach, (self.name, self._result))
+
+    @classmethod
+    def from_iterable(cls, data, storage: str = "shm", backend=None):
+        """
+        Shared data is created with ``publish`` or opened with ``attach``.
+        """
+        raise TypeError("Use SharedBar.publish or SharedBar.attach")
+
+    @classmethod
+    def load(cls, path: str, *args, **kwargs):
+        """
+        Snapshots are loaded as plain ``Bar`` instances.
+        """
+        raise TypeError("Use Bar.load and publish the result")
+
+    def extend(self, values) -> None:
+        """
+        Shared data is read-only.
+        """
+        raise TypeError("SharedBar can't be extended")
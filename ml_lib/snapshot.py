@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Versioned binary snapshot format for the state of ``Foo``, ``Bar`` and
+subclasses, see ``Foo.save`` and ``Foo.load``. A snapshot file contains:
+
+* A fixed-size header with magic bytes, format version, storage kind,
+  ``array`` typecode, byte order and item size of the elements, size,
+  result, number of stored elements and CRC32 of the stored elements.
+* The fully qualified class name, followed by the CRC32 of all the above.
+* Padding up to a multiple of 8 bytes, and the raw, native-endian elements
+  of ``_x`` (if any), so they can be memory-mapped instead of parsed.
+"""
+
+
+from typing import NamedTuple, Optional, Sequence
+import sys
+import zlib
+import mmap
+import struct
+from array import array
+from .storage import from_buffer
+
+
+MAGIC = b"MLSNAP"
+VERSION = 1
+# magic, version, class name length, storage, typecode, byte order, item
+# size, size, result, number of elements, data crc32
+HEADER = struct.Struct("=6sHH8sccB3xqqqI")
+BYTEORDER = b"<" if sys.byteorder == "little" else b">"
+CRC = struct.Struct("=I")
+ALIGNMENT = 8
+
+
+class SnapshotHeader(NamedTuple):
+    """
+    Contents of the header of a snapshot file, see ``read_header``.
+    """
+
+    cls: str
+    storage: str
+    typecode: str
+    size: int
+    result: int
+    count: int
+    data_crc: int
+    offset: int
+
+
+def class_name(cls: type) -> str:
+    """
+    :returns: The fully qualified name of ``cls``, as stored in snapshots.
+    """
+    return cls.__module__ + "." + cls.__qualname__
+
+
+def data_crc(data: Optional[Sequence[int]]) -> int:
+    """
+    :returns: CRC32 of the raw bytes of a buffer-backed ``data``, 0 if none.
+    """
+    if data is None:
+        return 0
+    with memoryview(data) as view, view.cast("B") as raw:
+        return zlib.crc32(raw)
+
+
+def write(
+    path: str,
+    instance,
+    storage: str = "",
+    typecode: str = "",
+    data: Optional[Sequence[int]] = None,
+    cls: Optional[type] = None,
+) -> None:
+    """
+    Write a snapshot of ``instance`` to ``path``, overwriting it.
+
+    :param storage: Storage kind of ``data``, empty if ``data`` is None.
+    :param typecode: ``array`` typecode of ``data``.
+    :param data: Buffer-backed elements to be stored after the header.
+    :param cls: Class recorded in the snapshot, which must be the one used
+      to load it. By default, the class of ``instance``.
+    """
+    name = class_name(cls or type(instance)).encode()
+    head = HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(name),
+        storage.encode(),
+        typecode.encode() or b"\0",
+        BYTEORDER,
+        array(typecode).itemsize if typecode else 0,
+        len(instance._x),
+        instance.get_result(),
+        0 if data is None else len(data),
+        data_crc(data),
+    )
+    head += name
+    head += CRC.pack(zlib.crc32(head))
+    head += b"\0" * (-len(head) % ALIGNMENT)
+    with open(path, "wb") as f:
+        f.write(head)
+        if data is not None:
+            f.write(data)
+
+
+def read_header(path: str, cls: type) -> SnapshotHeader:
+    """
+    :param cls: Class expected in the snapshot.
+    :returns: The parsed header of the snapshot in ``path``. Its ``offset``
+      is the byte position where the elements (if any) begin.
+    :raises ValueError: If the file is not a snapshot, was written with an
+      unsupported format version, is corrupted or truncated, or holds the
+      state of a class other than ``cls``.
+    """
+    with open(path, "rb") as f:
+        head = f.read(HEADER.size)
+        if len(head) < HEADER.size or head[: len(MAGIC)] != MAGIC:
+            raise ValueError("{} is not a snapshot file".format(path))
+        (
+            _,
+            version,
+            name_len,
+            storage,
+            typecode,
+            byteorder,
+            itemsize,
+            size,
+            result,
+            count,
+            crc,
+        ) = HEADER.unpack(head)
+        if version != VERSION:
+            raise ValueError(
+                "Unsupported snapshot version: {} != {}".format(
+                    version, VERSION
+                )
+            )
+        name = f.read(name_len)
+        stored_crc = f.read(CRC.size)
+        if (
+            len(stored_crc) < CRC.size
+            or CRC.unpack(stored_crc)[0] != zlib.crc32(head + name)
+        ):
+            raise ValueError("Corrupted snapshot header in {}".format(path))
+        offset = HEADER.size + name_len + CRC.size
+        offset += -offset % ALIGNMENT
+        f.seek(0, 2)
+        file_size = f.tell()
+    header = SnapshotHeader(
+        name.decode(),
+        storage.rstrip(b"\0").decode(),
+        typecode.rstrip(b"\0").decode(),
+        size,
+        result,
+        count,
+        crc,
+        offset,
+    )
+    if header.cls != class_name(cls):
+        raise ValueError(
+            "Snapshot class mismatch: {} != {}".format(
+                header.cls, class_name(cls)
+            )
+        )
+    if count and (
+        byteorder != BYTEORDER or itemsize != array(header.typecode).itemsize
+    ):
+        raise ValueError(
+            "Snapshot elements are incompatible with this platform: "
+            "{}{} with {} bytes".format(
+                byteorder.decode(), header.typecode, itemsize
+            )
+        )
+    if file_size < offset + count * itemsize:
+        raise ValueError("Truncated snapshot in {}".format(path))
+    return header
+
+
+def _check_data(path: str, header: SnapshotHeader, data) -> None:
+    """
+    :raises ValueError: If the CRC32 of ``data`` doesn't match the header.
+    """
+    if data_crc(data) != header.data_crc:
+        raise ValueError("Corrupted snapshot data in {}".format(path))
+
+
+def read_data(
+    path: str, header: SnapshotHeader, storage: str = "array"
+) -> Sequence[int]:
+    """
+    :param storage: ``array`` or ``numpy``.
+    :returns: A verified, writable copy of the elements stored in ``path``,
+      with the given storage.
+    :raises ValueError: If they don't match the CRC32 in the header.
+    """
+    with open(path, "rb") as f:
+        f.seek(header.offset)
+        if storage == "numpy":
+            raw = bytearray(header.count * array(header.typecode).itemsize)
+            f.readinto(raw)
+            data = from_buffer(raw, storage, header.typecode)
+        else:
+            data = array(header.typecode)
+            data.fromfile(f, header.count)
+    _check_data(path, header, data)
+    return data
+
+
+def map_data(
+    path: str,
+    header: SnapshotHeader,
+    storage: str = "array",
+    verify: bool = False,
+) -> Sequence[int]:
+    """
+    :param storage: ``array`` or ``numpy``.
+    :param verify: If true, check the CRC32 of the elements, which reads
+      all of them.
+    :returns: A read-only view of the elements stored in ``path``, backed
+      by a memory map: a typed ``memoryview`` for ``array`` storage, or a
+      NumPy array. Pages are only read when accessed, so this is O(1)
+      unless ``verify`` is true. The map is released once the returned
+      view (and all views derived from it) are collected.
+    :raises ValueError: If ``verify`` and the CRC32 doesn't match.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    nbytes = header.count * array(header.typecode).itemsize
+    with memoryview(mm) as view:
+        data = view[header.offset : header.offset + nbytes].cast(
+            header.typecode
+        )
+    if storage == "numpy":
+        data = from_buffer(data, storage, header.typecode)
+    if verify:
+        _check_data(path, header, data)
+    return data
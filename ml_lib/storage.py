@@ -0,0 +1,428 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Module with the interchangeable containers that can back the ``_x`` data of
+a ``Bar``. All of them support ``len``, integer indexing and a
+``list.index``-like lookup via ``index_of``:
+
+* ``list``: plain Python list of boxed ints (the original behaviour).
+* ``array``: compact ``array.array``, with the narrowest integer typecode
+  that fits the data.
+* ``numpy``: ``numpy.ndarray`` with the equivalent dtype. Requires NumPy.
+* ``paged``: ``PagedRange`` over a ``range``, with the elements allocated
+  lazily as lists of ``page_size`` boxed ints, upon first access to each
+  page.
+
+Typed ``memoryview`` objects (e.g. over a memory map) are also supported by
+``index_of``, but they can't be created or extended from here.
+"""
+
+
+from typing import Iterable, Sequence, Dict, List, Iterator
+from array import array
+from importlib.util import find_spec
+import re
+import struct
+import sys
+
+
+# NumPy is optional, and only imported once a numpy storage is requested
+HAS_NUMPY: bool = find_spec("numpy") is not None
+
+
+STORAGES = ("list", "array", "numpy", "paged")
+# signed integer typecodes, from narrowest to widest
+SIGNED_TYPECODES = "bhilq"
+# default number of elements per page of the paged storage
+PAGE_SIZE = 4096
+
+
+def _numpy():
+    """
+    :returns: The ``numpy`` module, imported upon first call.
+    :raises ImportError: If NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("numpy storage requires numpy to be installed")
+    return numpy
+
+
+def is_ndarray(obj) -> bool:
+    """
+    :returns: True if ``obj`` is a NumPy array. NumPy is not imported: if it
+      hasn't been imported yet, ``obj`` can't be an array.
+    """
+    np = sys.modules.get("numpy")
+    return np is not None and isinstance(obj, np.ndarray)
+
+
+class PagedRange(object):
+    """
+    Sequence with the elements of a ``range``, split into pages of
+    ``page_size`` elements. Each page is materialized as a list upon first
+    access to any of its elements, so memory usage is bounded by the pages
+    actually touched. ``len``, indexing, iteration and ``index`` behave
+    like with ``list(source)``. Existing elements can't be modified, and
+    elements appended via ``extend`` are kept in a regular list.
+    Each page is charged to the ``ml_lib.memory`` budget when materialized,
+    against this object (which may be shared by several Bars), so the
+    charge is released once it is collected.
+    """
+
+    __slots__ = (
+        "source",
+        "page_size",
+        "pages",
+        "tail",
+        "_page_bytes",
+        "__weakref__",
+    )
+
+    def __init__(self, source: range, page_size: int = PAGE_SIZE):
+        assert page_size > 0, "page_size has to be a positive int!"
+        self.source: range = source
+        self.page_size: int = page_size
+        self.pages: Dict[int, List[int]] = {}
+        self.tail: List[int] = []
+        self._page_bytes: int = 0
+
+    def page(self, number: int) -> List[int]:
+        """
+        :returns: The elements of the given page, materialized if needed.
+        :raises MemoryBudgetExceeded: If a budget was set with
+          ``ml_lib.memory.set_budget`` and the page doesn't fit in it.
+        """
+        try:
+            return self.pages[number]
+        except KeyError:
+            from .memory import charge, estimate
+
+            beg = number * self.page_size
+            values = self.source[beg : beg + self.page_size]
+            hi = max(abs(values[0]), abs(values[-1]))
+            charge(self, estimate(len(values), "list", 0, hi))
+            page = list(values)
+            self.pages[number] = page
+            self._page_bytes += nbytes(page)
+            return page
+
+    def __len__(self) -> int:
+        return len(self.source) + len(self.tail)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("PagedRange index out of range")
+        if idx >= len(self.source):
+            return self.tail[idx - len(self.source)]
+        number, offset = divmod(idx, self.page_size)
+        return self.page(number)[offset]
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterate without materializing any pages.
+        """
+        for beg in range(0, len(self.source), self.page_size):
+            page = self.pages.get(beg // self.page_size)
+            if page is None:
+                page = self.source[beg : beg + self.page_size]
+            yield from page
+        yield from self.tail
+
+    def index(self, value: int) -> int:
+        """
+        Like ``list.index``. The position is found arithmetically, and only
+        the page holding it is materialized and searched.
+
+        :raises ValueError: if ``value`` is not present.
+        """
+        try:
+            pos = self.source.index(value)
+        except ValueError:
+            return len(self.source) + self.tail.index(value)
+        number = pos // self.page_size
+        return number * self.page_size + self.page(number).index(value)
+
+    def extend(self, values: Iterable[int]) -> None:
+        """
+        Append ``values`` after the paged elements.
+        """
+        self.tail.extend(values)
+
+    def copy(self) -> "PagedRange":
+        """
+        :returns: A copy sharing the already materialized pages, which are
+          never modified, but not the appended elements.
+        """
+        result = PagedRange(self.source, self.page_size)
+        result.pages.update(self.pages)
+        result.tail.extend(self.tail)
+        result._page_bytes = self._page_bytes
+        return result
+
+    def __getstate__(self):
+        """
+        Pickling state, without the pages: they are materialized (and
+        charged) again on demand after unpickling.
+        """
+        return (self.source, self.page_size, self.tail)
+
+    def __setstate__(self, state) -> None:
+        source, page_size, tail = state
+        self.__init__(source, page_size)
+        self.tail.extend(tail)
+
+    def __sizeof__(self) -> int:
+        """
+        Bytes of this object, its page dict and the materialized elements.
+        """
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self.pages)
+            + self._page_bytes
+            + nbytes(self.tail)
+        )
+
+
+def narrowest_typecode(lo: int, hi: int) -> str:
+    """
+    :param lo: smallest value that has to be representable.
+    :param hi: largest value that has to be representable.
+    :returns: the ``array`` typecode with the smallest itemsize that can hold
+      all integers in ``[lo, hi]``.
+    :raises OverflowError: if not even 64 bits suffice.
+    """
+    for typecode in SIGNED_TYPECODES:
+        bits = 8 * array(typecode).itemsize
+        if -(2 ** (bits - 1)) <= lo and hi < 2 ** (bits - 1):
+            return typecode
+    raise OverflowError("Values don't fit in 64 bits: {}".format((lo, hi)))
+
+
+def typecode_of(container: Sequence[int]) -> str:
+    """
+    :returns: The ``array`` typecode of the elements of a buffer-backed
+      ``container`` (array, NumPy array or typed memoryview).
+    """
+    if isinstance(container, array):
+        return container.typecode
+    if isinstance(container, memoryview):
+        return container.format
+    return container.dtype.char
+
+
+def packed(container: Sequence[int]) -> Sequence[int]:
+    """
+    :returns: ``container`` if it is buffer-backed. Lists, tuples and paged
+      ranges are copied into an ``array`` with the narrowest typecode that
+      fits them.
+    """
+    if isinstance(container, (list, tuple, PagedRange)):
+        typecode = narrowest_typecode(min(container), max(container))
+        return array(typecode, container)
+    return container
+
+
+def from_buffer(data, storage: str, typecode: str) -> Sequence[int]:
+    """
+    Inverse of taking the raw bytes of an ``array`` or ``numpy`` container.
+
+    :param data: Object supporting the buffer protocol, with native-endian
+      integers of the given ``typecode``.
+    :returns: For ``numpy``, an array viewing ``data`` without copying
+      (read-only if ``data`` is). For ``array``, a copy of ``data``.
+    """
+    if storage == "numpy":
+        return _numpy().frombuffer(data, dtype=typecode)
+    result = array(typecode)
+    with memoryview(data) as view, view.cast("B") as raw:
+        result.frombytes(raw)
+    return result
+
+
+def typed_views(
+    buffer, offset: int, nbytes: int, typecode: str, readonly: bool = False
+) -> List[memoryview]:
+    """
+    :param buffer: Object supporting the buffer protocol, e.g. a memory map.
+    :returns: A chain of views over ``nbytes`` of ``buffer`` starting at
+      ``offset``, the last one cast to ``typecode`` (and read-only if
+      ``readonly``). Each view is derived from the previous one, so all of
+      them must be kept and released together with ``release_views``.
+    """
+    views = [memoryview(buffer)]
+    views.append(views[-1][offset : offset + nbytes])
+    if readonly:
+        views.append(views[-1].toreadonly())
+    views.append(views[-1].cast(typecode))
+    return views
+
+
+def release_views(views: List[memoryview]) -> None:
+    """
+    Release a chain of ``typed_views``, most derived first, so that the
+    underlying buffer can be closed afterwards.
+    """
+    for view in reversed(views):
+        view.release()
+
+
+def materialize(
+    values: Iterable[int],
+    storage: str = "list",
+    lo: int = 0,
+    hi: int = 0,
+    page_size: int = PAGE_SIZE,
+) -> Sequence[int]:
+    """
+    :param values: The integers to be stored. Must be a ``range`` for the
+      ``paged`` storage.
+    :param storage: One of ``STORAGES``.
+    :param lo: Lower bound of ``values``, used to narrow the integer width.
+    :param hi: Upper bound of ``values``, used to narrow the integer width.
+    :param page_size: Elements per page of the ``paged`` storage.
+    :returns: A new container of the given storage kind with ``values``.
+      For ``paged``, no elements are allocated yet.
+    """
+    assert storage in STORAGES, "storage must be one of {}".format(STORAGES)
+    if storage == "list":
+        return list(values)
+    if storage == "paged":
+        assert isinstance(values, range), "paged storage requires a range"
+        return PagedRange(values, page_size)
+    typecode = narrowest_typecode(lo, hi)
+    if storage == "array":
+        return array(typecode, values)
+    # else numpy
+    np = _numpy()
+    if isinstance(values, range):
+        return np.arange(values.start, values.stop, values.step, dtype=typecode)
+    return np.fromiter(values, dtype=typecode)
+
+
+def nbytes(container: Sequence[int]) -> int:
+    """
+    :returns: Bytes held by ``container``, including boxed elements for
+      lists and tuples. For views, only the viewed bytes are counted.
+    """
+    if isinstance(container, (list, tuple)):
+        return sys.getsizeof(container) + sum(map(sys.getsizeof, container))
+    if isinstance(container, memoryview):
+        return container.nbytes
+    if is_ndarray(container):
+        return container.nbytes
+    return sys.getsizeof(container)
+
+
+def readonly(container: Sequence[int]) -> Sequence[int]:
+    """
+    :returns: An immutable version of ``container`` that can be safely
+      shared: lists become tuples, arrays become read-only memoryviews and
+      NumPy arrays are flagged as non-writeable. Paged ranges are returned
+      as they are, since their elements can't be modified.
+    """
+    if isinstance(container, list):
+        return tuple(container)
+    if isinstance(container, PagedRange):
+        return container
+    if isinstance(container, array):
+        return memoryview(container).toreadonly()
+    container.flags.writeable = False
+    return container
+
+
+def mutable_copy(container: Sequence[int]) -> Sequence[int]:
+    """
+    :returns: A mutable copy of ``container``, inverse of ``readonly``.
+    """
+    if isinstance(container, (list, tuple)):
+        return list(container)
+    if isinstance(container, array):
+        return array(container.typecode, container)
+    if isinstance(container, memoryview):
+        result = array(container.format)
+        result.frombytes(container.cast("B"))
+        return result
+    return container.copy()
+
+
+def extend(
+    container: Sequence[int], values: Sequence[int], storage: str = "list"
+) -> Sequence[int]:
+    """
+    Append ``values`` at the end of ``container``. Non-list storages are
+    widened to a larger integer type if the new values don't fit.
+
+    :param values: Integers to append.
+    :param storage: The kind of ``container``, one of ``STORAGES``.
+    :returns: The extended container, which may be a new object.
+    """
+    if storage in ("list", "paged"):
+        container.extend(values)
+        return container
+    if not values:
+        return container
+    lo, hi = min(values), max(values)
+    if storage == "array":
+        try:
+            container.extend(array(container.typecode, values))
+            return container
+        except OverflowError:
+            if len(container):
+                lo, hi = min(lo, min(container)), max(hi, max(container))
+            return array(narrowest_typecode(lo, hi), list(container) + values)
+    # else numpy
+    np = _numpy()
+    if len(container):
+        lo = min(lo, int(container.min()))
+        hi = max(hi, int(container.max()))
+    typecode = narrowest_typecode(lo, hi)
+    return np.concatenate(
+        [container.astype(typecode, copy=False), np.array(values, typecode)]
+    )
+
+
+def _buffer_index(view: memoryview, value: int) -> int:
+    """
+    ``index_of`` for typed memoryviews, which lack an ``index`` method. The
+    byte pattern of ``value`` is searched without copying the buffer, and
+    only matches aligned to the item size are accepted.
+    """
+    try:
+        needle = struct.pack("=" + view.format, value)
+    except struct.error:
+        raise ValueError("{} is not in buffer".format(value)) from None
+    pattern = re.compile(re.escape(needle))
+    raw = view.cast("B")
+    try:
+        match = pattern.search(raw)
+        while match is not None:
+            if match.start() % view.itemsize == 0:
+                return match.start() // view.itemsize
+            match = pattern.search(raw, match.start() + 1)
+    finally:
+        raw.release()
+    raise ValueError("{} is not in buffer".format(value))
+
+
+def index_of(container: Sequence[int], value: int) -> int:
+    """
+    :returns: Position of the first occurrence of ``value`` in ``container``.
+    :raises ValueError: if ``value`` isn't in ``container``, like
+      ``list.index``.
+    """
+    if isinstance(container, memoryview):
+        return _buffer_index(container, value)
+    if is_ndarray(container):
+        hits = _numpy().flatnonzero(container == value)
+        if hits.size == 0:
+            raise ValueError("{} is not in array".format(value))
+        return int(hits[0])
+    return container.index(value)
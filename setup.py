@@ -20,7 +20,10 @@ Usage example::
 
 import sys
 import os
+import json
 import argparse
+from fnmatch import fnmatch
+from concurrent.futures import ThreadPoolExecutor
 from setuptools import setup, find_packages
 from ci_scripts.parse_metadata import parse_file
 
@@ -30,7 +33,45 @@ from ci_scripts.parse_metadata import parse_file
 # ##############################################################################
 
 
-def get_files_recursive(path):
+def scan_dir(path, cache):
+    """
+    List the contents of a single directory with ``os.scandir``, classifying
+    entries like ``os.walk`` does. Since adding, removing or renaming entries
+    updates the directory mtime, listings are reused from ``cache`` if the
+    mtime didn't change.
+
+    :param str path: Directory to be listed.
+    :param dict cache: Maps directory paths to ``{"mtime_ns", "files",
+      "dirs", "links"}`` dicts. Only read, since this runs in threads.
+    :returns: The ``(path, entry)`` pair, where ``entry`` is the (possibly
+      cached) listing, or ``None`` if the directory can't be read.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+        entry = cache.get(path)
+        if entry is not None and entry["mtime_ns"] == mtime_ns:
+            return path, entry
+        entry = {"mtime_ns": mtime_ns, "files": [], "dirs": [], "links": []}
+        with os.scandir(path) as it:
+            for e in it:
+                try:
+                    is_dir = e.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    entry["files"].append(e.name)
+                elif e.is_symlink():  # os.walk doesn't follow dir symlinks
+                    entry["links"].append(e.name)
+                else:
+                    entry["dirs"].append(e.name)
+    except OSError:
+        return path, None
+    return path, entry
+
+
+def get_files_recursive(
+    path, include=("*",), exclude=(), cache_path=None, workers=None
+):
     """
     Usually we want to recursively include a folder with non-Python data into
     the Python distribution. This can be done with MANIFEST.in, but we prefer
@@ -38,17 +79,63 @@ def get_files_recursive(path):
     name changes, no inconsistent MANIFEST is left behind. For that, we gather
     the paths with this function(source: https://stackoverflow.com/a/36693250).
 
+    The tree is listed level by level, with the directories of each level
+    scanned in parallel threads. The result (including its order) is the
+    same as with a top-down ``os.walk``.
+
     :param str dir_path: Path to the directory that will be recursively
       traversed.
+    :param include: Glob patterns, a file path is only kept if it matches any.
+    :param exclude: Glob patterns, a file path is dropped if it matches any.
+    :param cache_path: Optional JSON file with the directory listings of
+      previous runs. Directories whose mtime didn't change are not listed
+      again. The file is created or updated.
+    :param workers: Number of scanning threads. Default as in
+      ``ThreadPoolExecutor``.
     :returns: A list of all the paths to files in the ``dir_path`` as strings.
     """
     if os.path.isfile(path):
         return [os.path.join("..", path)]
     # else
+    cache = {}
+    if cache_path is not None and os.path.isfile(cache_path):
+        with open(cache_path, "r") as f:
+            cache = json.load(f)
+    listings = {}
+    with ThreadPoolExecutor(workers) as executor:
+        level = [path]
+        while level:
+            scanned = executor.map(lambda p: scan_dir(p, cache), level)
+            level = []
+            for pth, entry in scanned:
+                if entry is not None:
+                    listings[pth] = entry
+                    level.extend(os.path.join(pth, d) for d in entry["dirs"])
+    if cache_path is not None:
+        # replace the entries of this tree, dropping the ones gone missing
+        cache = {
+            k: v
+            for k, v in cache.items()
+            if not (k == path or k.startswith(os.path.join(path, "")))
+        }
+        cache.update(listings)
+        with open(cache_path, "w") as f:
+            json.dump(cache, f)
+    # assemble in top-down os.walk order
     paths = []
-    for (pth, _, filenames) in os.walk(path):  # ignore directories
-        for filename in filenames:
-            paths.append(os.path.join("..", pth, filename))
+    stack = [path]
+    while stack:
+        pth = stack.pop()
+        entry = listings.get(pth)
+        if entry is None:
+            continue
+        for filename in entry["files"]:
+            filepath = os.path.join(pth, filename)
+            if any(fnmatch(filepath, p) for p in include) and not any(
+                fnmatch(filepath, p) for p in exclude
+            ):
+                paths.append(os.path.join("..", filepath))
+        stack.extend(os.path.join(pth, d) for d in reversed(entry["dirs"]))
     return paths
 
 
@@ -90,13 +177,51 @@ parser.add_argument(
     default=["tests.*", "tests", "*.tests", "*.tests.*"],
     help="Patterns to be excluded from the package, usually tests. See default",
 )
+parser.add_argument(
+    "--include_globs",
+    nargs="+",
+    type=str,
+    default=["*"],
+    help="Only files under the include paths matching these globs are added",
+)
+parser.add_argument(
+    "--exclude_globs",
+    nargs="+",
+    type=str,
+    default=[],
+    help="Files under the include paths matching these globs are skipped",
+)
+parser.add_argument(
+    "--manifest_cache",
+    type=str,
+    default=None,
+    help="JSON file to cache directory listings of the include paths",
+)
+parser.add_argument(
+    "--scan_workers",
+    type=int,
+    default=None,
+    help="Number of threads used to list the include paths",
+)
 
 args, unknown_args = parser.parse_known_args()
 sys.argv = sys.argv[0:1] + unknown_args  # pass the remaining args to setup
 #
 PACKAGE_NAME = args.package_name
 METADATA_PATH = os.path.normpath(args.metadata_path)
-EXTRA_FILES = sum([get_files_recursive(f) for f in args.include_files], [])
+EXTRA_FILES = sum(
+    [
+        get_files_recursive(
+            f,
+            args.include_globs,
+            args.exclude_globs,
+            args.manifest_cache,
+            args.scan_workers,
+        )
+        for f in args.include_files
+    ],
+    [],
+)
 EXCLUDE_PACKAGES = args.exclude_packages
 
 # The "Rigid" part: we still assume a certain metadata structure
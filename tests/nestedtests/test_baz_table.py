@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.nested.baz_table module. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import unittest
+from unittest import mock
+from ml_lib.nested.baz_module import Baz
+from ml_lib.nested import baz_table
+from ml_lib.nested.baz_table import BazTable, FIELDS
+
+
+class BazTableTestCaseCpu(unittest.TestCase):
+    """
+    Appending, row views, reductions, filters and memory.
+    """
+
+    def make_table(self) -> BazTable:
+        table = BazTable()
+        table.append(Baz())
+        table.append(a=5, r=-7)
+        table.extend([{"a": 1000}, Baz()])
+        table.extend_columns(a=[1, 2, 3], b=[4, 5, 6])
+        return table
+
+    def test_rows(self) -> None:
+        """
+        Row views and defaults
+        """
+        self.assertEqual(len(FIELDS), 17)
+        table = self.make_table()
+        self.assertEqual(len(table), 7)
+        self.assertEqual(
+            [table[i].a for i in range(7)], [123, 5, 1000, 123, 1, 2, 3]
+        )
+        self.assertEqual(table[1].r, -7)
+        self.assertEqual(table[-1].b, 6)
+        self.assertEqual(table[2].q, 123)
+        self.assertRaises(IndexError, table.__getitem__, 7)
+        self.assertRaises(AttributeError, getattr, table[0], "l")
+        self.assertRaises(AssertionError, table.extend_columns, a=[1], b=[])
+        self.assertRaises(AssertionError, table.extend_columns, l=[1])
+
+    def test_reductions(self) -> None:
+        """
+        Same results with and without NumPy
+        """
+        for has_numpy in {False, baz_table.HAS_NUMPY}:
+            with mock.patch.object(baz_table, "HAS_NUMPY", has_numpy):
+                table = self.make_table()
+                self.assertEqual(table.reduce("a"), 1257)
+                self.assertEqual(table.reduce("a", "min"), 1)
+                self.assertEqual(table.reduce("r", "min"), -7)
+                self.assertEqual(table.reduce("a", "max"), 1000)
+                self.assertEqual(table.where("a", "<", 100), [1, 4, 5, 6])
+                self.assertEqual(table.where("b", "==", 5), [5])
+                self.assertEqual(table.where("r", ">", 200), [])
+
+    def test_memory(self) -> None:
+        """
+        Per-record memory is 17 times the (widened) integer width
+        """
+        table = BazTable()
+        table.extend_columns(a=list(range(10000)))
+        # a needs 2 bytes, the rest (all 123) fit in 1
+        self.assertEqual(table.memory_footprint(), 10000 * (2 + 16))
+
+    def test_append_with_views(self) -> None:
+        """
+        Appending while column views are alive, and invalid values, must
+        leave all columns aligned
+        """
+        for has_numpy in {False, baz_table.HAS_NUMPY}:
+            with mock.patch.object(baz_table, "HAS_NUMPY", has_numpy):
+                table = self.make_table()
+                view = table.column("r")
+                table.append(a=9, r=1 << 40)  # also widens r
+                table.append(a=10)
+                self.assertEqual(len(view), 7)
+                self.assertEqual(len(table), 9)
+                for name in FIELDS:
+                    self.assertEqual(len(table.column(name)), 9)
+                self.assertEqual(table[7].r, 1 << 40)
+                self.assertEqual(table[8].a, 10)
+                self.assertRaises(TypeError, table.append, a=1, b="x")
+                self.assertEqual(
+                    {len(table.column(name)) for name in FIELDS}, {9}
+                )
+                self.assertEqual(len(table), 9)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.async_module. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import unittest
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from ml_lib.foo_module import Foo
+from ml_lib.async_module import AsyncFoo, AsyncBar
+
+
+class AsyncFooTestCaseCpu(unittest.TestCase):
+    """
+    Awaitable loops must match the synchronous ones, and yield to other
+    coroutines while running.
+    """
+
+    CLASS = AsyncFoo
+    SIZE = 1000000
+
+    def test_loop(self) -> None:
+        """
+        Same results as ``Foo.loop`` and ``Foo.advance``, with and without
+        executor
+        """
+        f = self.CLASS(self.SIZE)
+        self.assertIsInstance(f, Foo)
+        for times in (0, 1, 10):
+            asyncio.run(f.loop(times, yield_every=3))
+            self.assertEqual(f.get_result(), times)
+            with ThreadPoolExecutor(1) as executor:
+                asyncio.run(f.loop(times, 4, executor))
+            self.assertEqual(f.get_result(), times)
+        asyncio.run(f.loop(-5))
+        self.assertEqual(f.get_result(), 0)
+        self.assertRaises(TypeError, asyncio.run, f.loop(2.7))
+        asyncio.run(f.loop(10))
+        asyncio.run(f.advance(5, 2))
+        self.assertEqual(f.get_result(), 15)
+        with ThreadPoolExecutor(1) as executor:
+            asyncio.run(f.advance(3, executor=executor))
+        self.assertEqual(f.get_result(), 18)
+
+    def test_closed_form(self) -> None:
+        """
+        With a closed form, the whole loop runs in a single step
+        """
+
+        class Counting(self.CLASS):
+            def _run(self, times: int) -> None:
+                self.runs.append(times)
+                super(Counting, self)._run(times)
+
+        f = Counting(self.SIZE)
+        f.runs = []
+        asyncio.run(f.loop(10, yield_every=3))
+        self.assertEqual(f.get_result(), 10)
+        expected = [10] if f._has_closed_form() else [3, 3, 3, 1]
+        self.assertEqual(f.runs, expected)
+
+    def test_cooperative(self) -> None:
+        """
+        Another coroutine gets to run between chunks
+        """
+
+        class Stepwise(self.CLASS):
+            def _computation(self) -> None:
+                super(Stepwise, self)._computation()
+
+        f = Stepwise(self.SIZE)
+        ticks = []
+
+        async def ticker() -> None:
+            for _ in range(3):
+                ticks.append(f.get_result())
+                await asyncio.sleep(0)
+
+        async def main() -> None:
+            await asyncio.gather(f.loop(10, yield_every=2), ticker())
+
+        asyncio.run(main())
+        self.assertEqual(f.get_result(), 10)
+        self.assertEqual(ticks, [2, 4, 6])
+
+
+class AsyncBarTestCaseCpu(AsyncFooTestCaseCpu):
+    """
+    Applies the AsyncFoo tests to AsyncBar.
+    """
+
+    CLASS = AsyncBar
+    SIZE = 1000
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.backends module. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import os
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from ml_lib.foo_module import Foo
+from ml_lib.bar_module import Bar
+from ml_lib.async_module import AsyncBar
+from ml_lib import backends
+from ml_lib.backends import (
+    BACKEND_ENV_VAR,
+    BACKENDS,
+    ProcessBackend,
+    get_backend,
+)
+from ml_lib.storage import HAS_NUMPY
+
+
+class BackendsTestCaseCpu(unittest.TestCase):
+    """
+    Backend selection, and equality of results across backends.
+    """
+
+    def test_selection(self) -> None:
+        """
+        Explicit names take precedence over the environment
+        """
+        with mock.patch.dict(os.environ, {BACKEND_ENV_VAR: "process"}):
+            self.assertEqual(Foo()._backend.name, "process")
+            self.assertEqual(Foo(backend="python")._backend.name, "python")
+        with mock.patch.dict(os.environ):
+            os.environ.pop(BACKEND_ENV_VAR, None)
+            self.assertEqual(get_backend().name, "python")
+            b = Bar.from_iterable([1, 2], backend="process")
+            self.assertEqual(b._backend.name, "process")
+            b.set_backend()
+            self.assertEqual(b._backend.name, "python")
+        self.assertRaises(AssertionError, get_backend, "cuda")
+        if not HAS_NUMPY:
+            self.assertRaises(ImportError, get_backend, "numpy")
+
+    def test_same_results(self) -> None:
+        """
+        All backends and storages give the same results and errors
+        """
+        backends = [b for b in BACKENDS if b != "numpy" or HAS_NUMPY]
+        storages = ["list", "array"] + (["numpy"] if HAS_NUMPY else [])
+        for backend in backends:
+            for storage in storages:
+                b = Bar(1000, storage=storage, backend=backend)
+                b.loop(5)
+                self.assertEqual(b.get_result(), 5)
+                b = Bar.from_iterable([3, 4, 1], storage, backend)
+                self.assertRaises(ValueError, b.loop, 1)
+        # a process backend that really splits short loops
+        b = Bar(1000)
+        b._backend = ProcessBackend(workers=2, min_times=1)
+        b.loop(7)
+        self.assertEqual(b.get_result(), 7)
+        b.advance(3)
+        self.assertEqual(b.get_result(), 10)
+
+    def test_process_sessions(self) -> None:
+        """
+        A single pool is started per ``iter_loop`` or budgeted ``loop``
+        """
+        b = Bar(1000)
+        b._backend = ProcessBackend(workers=2, min_times=1)
+        with mock.patch.object(
+            backends, "LoopPool", wraps=backends.LoopPool
+        ) as pool:
+            snapshots = list(b.iter_loop(9, every=3))
+            self.assertEqual(snapshots, [(3, 3), (6, 6), (9, 9)])
+            self.assertEqual(pool.call_count, 1)
+            self.assertEqual(b.loop(8, max_seconds=60, check_every=2), 8)
+            self.assertEqual(b.get_result(), 8)
+            self.assertEqual(pool.call_count, 2)
+            b.advance(4)  # a single run, outside of any session
+            self.assertEqual(pool.call_count, 3)
+        self.assertEqual(b.get_result(), 12)
+        self.assertEqual(b._backend._sessions, {})
+
+    def test_process_sessions_async(self) -> None:
+        """
+        A single pool is started per async ``loop``, also when its chunks
+        run in an executor
+        """
+        b = AsyncBar(1000)
+        b._backend = ProcessBackend(workers=2, min_times=1)
+        with mock.patch.object(
+            backends, "LoopPool", wraps=backends.LoopPool
+        ) as pool:
+            asyncio.run(b.loop(9, yield_every=3))
+            self.assertEqual(b.get_result(), 9)
+            self.assertEqual(pool.call_count, 1)
+            with ThreadPoolExecutor(2) as executor:
+                asyncio.run(b.loop(9, 3, executor))
+            self.assertEqual(b.get_result(), 9)
+            self.assertEqual(pool.call_count, 2)
+        self.assertEqual(b._backend._sessions, {})
@@ -8,8 +8,11 @@ https://docs.python.org/3/library/unittest.html#assert-methods
 """
 
 
+import pickle
+import unittest
 from ml_lib.foo_module import Foo
 from ml_lib.bar_module import Bar
+from ml_lib.storage import HAS_NUMPY
 from .test_foo import TestcaseFooCpu
 
 
@@ -29,6 +32,157 @@ class BarTestCaseCpu(TestcaseFooCpu):
         self.assertIsInstance(b, Bar)
         self.assertIsInstance(b, Foo)
 
+    def test_storages(self) -> None:
+        """
+        All storage backends must yield the same behaviour, and non-list
+        storages must narrow the integer width to the data
+        """
+        storages = ["list", "array", "paged"]
+        storages += ["numpy"] if HAS_NUMPY else []
+        for storage in storages:
+            b = self.CLASS(1000, storage=storage)
+            self.assertEqual(len(b._x), 1000)
+            self.assertEqual(b._x[999], 999)
+            self.assertEqual(b.index(999), 999)
+            self.assertRaises(ValueError, b.index, 1000)
+            b.loop(3)
+            self.assertEqual(b.get_result(), 3)
+        self.assertRaises(AssertionError, self.CLASS, 10, storage="tuple")
+        self.assertEqual(self.CLASS(100, storage="array")._x.itemsize, 1)
+        self.assertEqual(self.CLASS(40000, storage="array")._x.itemsize, 4)
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_numpy_dtype(self) -> None:
+        """
+        NumPy storage narrows the dtype like the array storage
+        """
+        self.assertEqual(self.CLASS(100, storage="numpy")._x.dtype.itemsize, 1)
+        self.assertEqual(
+            self.CLASS(40000, storage="numpy")._x.dtype.itemsize, 4
+        )
+
+    def test_from_iterable(self) -> None:
+        """
+        Indexed Bars must behave like ``list.index`` on arbitrary data,
+        also after appending
+        """
+        data = [5, -3, 7, 5, 2, 300]
+        storages = ["list", "array"] + (["numpy"] if HAS_NUMPY else [])
+        for storage in storages:
+            b = self.CLASS.from_iterable(data, storage=storage)
+            for value in data:
+                self.assertEqual(b.index(value), data.index(value))
+            self.assertRaises(ValueError, b.index, 4)
+            b.loop(2)  # looks up len(data) - 1 = 5
+            self.assertEqual(b.get_result(), 2)
+            b.extend([2 ** 40, 6, -3])
+            self.assertEqual(b.index(2 ** 40), 6)
+            self.assertEqual(b.index(6), 7)
+            self.assertEqual(b.index(-3), 1)
+            self.assertEqual(b._x[6], 2 ** 40)
+            self.assertRaises(ValueError, b.loop, 1)  # 8 is not present
+            b.append(9)
+            b.loop(3)
+            self.assertEqual(b.get_result(), 3)
+        self.assertRaises(AssertionError, self.CLASS.from_iterable, [])
+
+    def test_paged(self) -> None:
+        """
+        Paged data must behave like a list, while only allocating the
+        pages that are accessed
+        """
+        size, page_size = 1000, 64
+        b = self.CLASS(size, storage="paged", page_size=page_size)
+        ref = list(range(size))
+        self.assertEqual(b._x.pages, {})
+        empty_bytes = b.memory_footprint()
+        b.loop(3)  # looks up 999, in the last page
+        self.assertEqual(b.get_result(), 3)
+        if self.BACKEND != "process":  # otherwise paged in the workers
+            self.assertEqual(list(b._x.pages), [size // page_size])
+            self.assertGreater(b.memory_footprint(), empty_bytes)
+        for idx in (0, 63, 64, 500, -1, -1000):
+            self.assertEqual(b._x[idx], ref[idx])
+        for value in (0, 63, 64, 999):
+            self.assertEqual(b.index(value), ref.index(value))
+        self.assertEqual(b._x[10:200:7], ref[10:200:7])
+        self.assertRaises(IndexError, b._x.__getitem__, size)
+        self.assertRaises(ValueError, b.index, size)
+        self.assertEqual(len(b._x.pages), 6)
+        self.assertEqual(list(b._x), ref)  # iteration allocates nothing
+        self.assertEqual(len(b._x.pages), 6)
+        #
+        b.extend([5, 2000])
+        ref.extend([5, 2000])
+        self.assertEqual(len(b._x), len(ref))
+        self.assertEqual(b._x[-1], 2000)
+        self.assertEqual(b.index(2000), ref.index(2000))
+        self.assertEqual(b.index(5), ref.index(5))
+        # shared data is copied upon extension, sharing pages
+        s1 = self.CLASS(size, storage="paged", shared=True)
+        s2 = self.CLASS(size, storage="paged", shared=True)
+        self.assertIs(s1._x, s2._x)
+        s1.append(7)
+        self.assertEqual((len(s1._x), len(s2._x)), (size + 1, size))
+
+    def test_pickle(self) -> None:
+        """
+        Bars must round-trip through pickle with any storage and protocol,
+        and buffer-backed data must be sent out-of-band with protocol 5
+        """
+        storages = ["list", "array", "paged"]
+        storages += ["numpy"] if HAS_NUMPY else []
+        for storage in storages:
+            for shared in (False, True):
+                b = self.CLASS(300, storage=storage, shared=shared)
+                b.loop(2)
+                for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                    c = pickle.loads(pickle.dumps(b, protocol))
+                    self.assertIs(type(c), self.CLASS)
+                    self.assertEqual(list(c._x), list(range(300)))
+                    self.assertEqual(c._storage, storage)
+                    self.assertEqual(c.get_result(), 2)
+                    self.assertEqual(c._backend.name, self.BACKEND)
+                buffers = []
+                data = pickle.dumps(b, 5, buffer_callback=buffers.append)
+                self.assertEqual(
+                    len(buffers), int(storage in ("array", "numpy"))
+                )
+                if buffers:  # the 600 data bytes aren't in the pickle
+                    self.assertLess(len(data), 300)
+                c = pickle.loads(data, buffers=buffers)
+                self.assertEqual(list(c._x), list(range(300)))
+        b = self.CLASS.from_iterable([4, 2, 9], storage="array")
+        c = pickle.loads(pickle.dumps(b, 5))
+        self.assertEqual(c._index, {4: 0, 2: 1, 9: 2})
+        c.loop(1)  # looks up 2
+        self.assertEqual(c.get_result(), 1)
+
     # def test_fail(self) -> None:
     #     """"""
     #     self.assertTrue(False)
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class BarTestCaseNumpy(BarTestCaseCpu):
+    """
+    Applies all the Bar tests with the numpy backend.
+    """
+
+    BACKEND = "numpy"
+
+
+class BarTestCaseProcess(BarTestCaseCpu):
+    """
+    Applies all the Bar tests with the process backend.
+    """
+
+    BACKEND = "process"
+
+
+class BarTestCaseJit(BarTestCaseCpu):
+    """
+    Applies all the Bar tests with the jit backend (or its fallback).
+    """
+
+    BACKEND = "jit"
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.batch_module. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import unittest
+from ml_lib.foo_module import Foo
+from ml_lib.bar_module import Bar
+from ml_lib.batch_module import FooBatch, BarBatch
+from ml_lib.storage import HAS_NUMPY
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class FooBatchTestCaseCpu(unittest.TestCase):
+    """
+    Batched results must match running the instances one by one.
+    """
+
+    CLASS = FooBatch
+    SINGLE = Foo
+
+    def test_init_parameter(self) -> None:
+        """
+        Sizes have to be positive ints
+        """
+        self.assertRaises(AssertionError, self.CLASS, [3, 0])
+        self.assertRaises(AssertionError, self.CLASS, [-1])
+        self.assertRaises(ValueError, self.CLASS, ["a"])
+
+    def test_loop(self) -> None:
+        """
+        Batch vs. one-by-one, including scalar broadcasting
+        """
+        sizes = [1, 5, 100, 7]
+        times = [3, 0, 2, 10]
+        batch = self.CLASS(sizes)
+        self.assertEqual(len(batch), 4)
+        self.assertEqual(batch.get_results().tolist(), [0, 0, 0, 0])
+        batch.loop(times)
+        expected = []
+        for size, t in zip(sizes, times):
+            single = self.SINGLE(size)
+            single.loop(t)
+            expected.append(single.get_result())
+        self.assertEqual(batch.get_results().tolist(), expected)
+        batch.loop(4)
+        self.assertEqual(batch.get_results().tolist(), [4, 4, 4, 4])
+        self.assertRaises(AssertionError, batch.loop, [1, 1, -1, 1])
+        self.assertRaises(ValueError, batch.loop, [1, 1])
+        self.assertRaises(TypeError, batch.loop, [2.7, 1.2, 1, 1])
+        self.assertRaises(TypeError, batch.loop, 2.0)
+
+
+class BarBatchTestCaseCpu(FooBatchTestCaseCpu):
+    """
+    Applies the FooBatch tests to BarBatch.
+    """
+
+    CLASS = BarBatch
+    SINGLE = Bar
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.bench module. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import os
+import copy
+import json
+import tempfile
+import unittest
+from ml_lib.bench import BENCHMARKS, run, compare, welch_t, main
+
+
+class BenchTestCaseCpu(unittest.TestCase):
+    """
+    Smoke test of the benchmark runner and regression detection.
+    """
+
+    def test_run(self) -> None:
+        """
+        All benchmarks run and produce well-formed results
+        """
+        results = run(sizes=[10, 20], times=[2], repeats=2)
+        self.assertEqual(results["meta"]["repeats"], 2)
+        keys = results["results"].keys()
+        for name, (_, uses_times) in BENCHMARKS.items():
+            self.assertIn(
+                name + ("[size=10,times=2]" if uses_times else "[size=10]"),
+                keys,
+            )
+        for res in results["results"].values():
+            self.assertEqual(len(res["wall"]), 2)
+            self.assertEqual(len(res["cpu"]), 2)
+            self.assertGreaterEqual(res["peak_bytes"], 0)
+
+    def test_compare(self) -> None:
+        """
+        Only significant slowdowns and memory growth are flagged
+        """
+        self.assertGreater(welch_t([1, 1.1, 0.9], [2, 2.1, 1.9]), 3)
+        self.assertLess(welch_t([2, 2.1, 1.9], [1, 1.1, 0.9]), -3)
+        base = {
+            "results": {
+                "a": {"wall": [1.0, 1.1, 0.9], "peak_bytes": 100},
+                "b": {"wall": [1.0, 1.1, 0.9], "peak_bytes": 100},
+            }
+        }
+        cur = copy.deepcopy(base)
+        self.assertEqual(compare(base, cur), [])
+        cur["results"]["a"]["wall"] = [2.0, 2.1, 1.9]  # significant
+        cur["results"]["b"]["wall"] = [0.5, 3.0, 0.4]  # noisy
+        cur["results"]["b"]["peak_bytes"] = 200
+        cur["results"]["c"] = cur["results"]["a"]  # not in baseline
+        regressions = compare(base, cur)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("a: wall time"))
+        self.assertTrue(regressions[1].startswith("b: peak memory"))
+
+    def test_cli(self) -> None:
+        """
+        ``run`` writes a JSON file and ``compare`` against itself passes
+        """
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            argv = ["run", "-o", path, "-s", "10", "-t", "2", "-r", "2"]
+            self.assertEqual(main(argv + ["-b", "Foo.loop"]), 0)
+            with open(path) as f:
+                self.assertEqual(
+                    list(json.load(f)["results"]), ["Foo.loop[size=10,times=2]"]
+                )
+            self.assertEqual(main(["compare", path, path]), 0)
+        finally:
+            os.remove(path)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.cache module. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import unittest
+from ml_lib.bar_module import Bar
+from ml_lib.cache import BufferCache, BUFFER_CACHE
+from ml_lib.storage import HAS_NUMPY, nbytes
+
+
+class BufferCacheTestCaseCpu(unittest.TestCase):
+    """
+    Counters, eviction policy and copy-on-write sharing.
+    """
+
+    def test_lru_eviction(self) -> None:
+        """
+        Hits, misses and byte-budget LRU evictions are counted
+        """
+        entry_bytes = nbytes(BufferCache().get(100, "array"))
+        self.assertEqual(entry_bytes, 100)
+        cache = BufferCache(max_bytes=210)
+        a = cache.get(100, "array")
+        self.assertIs(cache.get(100, "array"), a)
+        cache.get(101, "array")
+        cache.get(100, "array")  # 100 is now most recently used
+        cache.get(102, "array")  # evicts 101
+        self.assertEqual(
+            cache.stats(),
+            {
+                "hits": 2,
+                "misses": 3,
+                "evictions": 1,
+                "entries": 2,
+                "bytes": 202,
+            },
+        )
+        self.assertIs(cache.get(100, "array"), a)
+        cache.get(101, "array")
+        self.assertEqual(cache.stats()["misses"], 4)
+        # too large to be cached at all
+        big = cache.get(10000, "array")
+        self.assertEqual(len(big), 10000)
+        self.assertEqual(cache.stats()["entries"], 2)
+        cache.clear()
+        self.assertEqual(cache.stats()["hits"], 0)
+
+    def test_paged(self) -> None:
+        """
+        Paged entries are re-measured as their pages are materialized, and
+        evicted once they outgrow the cache
+        """
+        cache = BufferCache(max_bytes=250000)
+        paged = cache.get(10000, "paged")
+        self.assertIs(cache.get(10000, "paged"), paged)
+        initial_bytes = cache.stats()["bytes"]
+        self.assertLess(initial_bytes, 1000)
+        paged[0]
+        self.assertGreater(cache.stats()["bytes"], initial_bytes + 4096 * 8)
+        self.assertEqual(cache.stats()["bytes"], nbytes(paged))
+        paged[-1]
+        paged[5000]
+        self.assertEqual(cache.stats()["entries"], 0)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertIsNot(cache.get(10000, "paged"), paged)
+
+    def test_shared_bar(self) -> None:
+        """
+        Shared Bars use the same immutable buffer until they are mutated
+        """
+        storages = ["list", "array"] + (["numpy"] if HAS_NUMPY else [])
+        for storage in storages:
+            hits = BUFFER_CACHE.hits
+            b1 = Bar(1000, storage=storage, shared=True)
+            b2 = Bar(1000, storage=storage, shared=True)
+            self.assertEqual(BUFFER_CACHE.hits, hits + 1)
+            self.assertIs(b1._x, b2._x)
+            with self.assertRaises((TypeError, ValueError)):
+                b1._x[0] = 5
+            b1.loop(3)
+            self.assertEqual(b1.get_result(), 3)
+            b1.append(1000)
+            self.assertIsNot(b1._x, b2._x)
+            self.assertEqual(len(b1._x), 1001)
+            self.assertEqual(len(b2._x), 1000)
+            self.assertEqual(b1.index(1000), 1000)
+            self.assertEqual(b2.index(999), 999)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.concurrent_module. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import sys
+import pickle
+import threading
+from ml_lib.foo_module import Foo
+from ml_lib.concurrent_module import ConcurrentFoo, ConcurrentBar
+from .test_foo import TestcaseFooCpu
+
+
+class ConcurrentFooTestCaseCpu(TestcaseFooCpu):
+    """
+    Applies all the Foo tests to ConcurrentFoo, plus a stress test with
+    many threads looping on the same instance.
+    """
+
+    CLASS = ConcurrentFoo
+    THREADS = 32
+    ROUNDS = 200
+
+    def _hammer(self, instance, times: int) -> None:
+        """
+        Call ``advance(times)`` ``ROUNDS`` times from each of ``THREADS``
+        threads at once.
+        """
+        barrier = threading.Barrier(self.THREADS)
+
+        def work() -> None:
+            barrier.wait()
+            for _ in range(self.ROUNDS):
+                instance.advance(times)
+
+        threads = [threading.Thread(target=work) for _ in range(self.THREADS)]
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # as many thread switches as possible
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+    def test_stress(self) -> None:
+        """
+        No increments are lost, with and without closed form, and the
+        shards of finished threads are folded into the base
+        """
+        f = self.CLASS(100)
+        self.assertIsInstance(f, Foo)
+        f.loop(3)
+        self._hammer(f, 5)
+        expected = 3 + self.THREADS * self.ROUNDS * 5
+        self.assertEqual(f.get_result(), expected)
+        self.assertEqual(len(f._counter._shards), 1)  # the others are folded
+        f.reset()
+        self.assertEqual(f.get_result(), 0)
+        f.advance(2)
+        self.assertEqual(f.get_result(), 2)
+        #
+        b = ConcurrentBar.from_iterable([3, 0, 1, 2])
+        self.assertFalse(b._has_closed_form())
+        self._hammer(b, 2)
+        self.assertEqual(b.get_result(), self.THREADS * self.ROUNDS * 2)
+
+    def test_shards(self) -> None:
+        """
+        Restarting, resetting, iterating, checkpoints and pickling merge the
+        shards
+        """
+        f = self.CLASS(100)
+        f.loop(4)
+        thread = threading.Thread(target=f.advance, args=(6,))
+        thread.start()
+        thread.join()
+        self.assertEqual(f.get_result(), 10)
+        f.advance(1)
+        self.assertEqual(f.get_result(), 11)
+        self.assertEqual(list(f.iter_loop(2, resume=True)), [(1, 12), (2, 13)])
+        #
+        state = f.checkpoint()
+        self.assertEqual(state["result"], 13)
+        g = pickle.loads(pickle.dumps(f))
+        self.assertEqual(g.get_result(), 13)
+        g.reset()
+        self.assertEqual(g.get_result(), 0)
+        g.restore(state)
+        self.assertEqual(g.get_result(), 13)
+        g.loop(2)  # restarts all shards
+        self.assertEqual(g.get_result(), 2)
+        f.reset()
+        self.assertEqual(f.get_result(), 0)
+
+
+class ConcurrentBarTestCaseCpu(ConcurrentFooTestCaseCpu):
+    """
+    Applies all the ConcurrentFoo tests to ConcurrentBar.
+    """
+
+    CLASS = ConcurrentBar
@@ -8,16 +8,41 @@ https://docs.python.org/3/library/unittest.html#assert-methods
 """
 
 
+import os
+import time
 import unittest
+from unittest import mock
+import json
+import pickle
 from ml_lib.foo_module import Foo
+from ml_lib.backends import BACKEND_ENV_VAR, BACKENDS
+from ml_lib.storage import HAS_NUMPY
 
 
 class TestcaseFooCpu(unittest.TestCase):
     """
-    Basic testing of class Foo with minimal coverage
+    Basic testing of class Foo with minimal coverage. All instances are
+    created with the compute backend given by ``BACKEND``.
     """
 
     CLASS = Foo
+    BACKEND = "python"
+
+    def setUp(self) -> None:
+        """
+        Select the backend through the environment, so the tests themselves
+        are the same for all backends
+        """
+        patcher = mock.patch.dict(os.environ, {BACKEND_ENV_VAR: self.BACKEND})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        if self.BACKEND == "process":
+            # so that the short loops of the tests are split across a pool
+            process = BACKENDS["process"]
+            for name, value in (("workers", 2), ("min_times", 1)):
+                patcher = mock.patch.object(process, name, value)
+                patcher.start()
+                self.addCleanup(patcher.stop)
 
     def test_init_parameter(self) -> None:
         """
@@ -41,3 +66,143 @@ class TestcaseFooCpu(unittest.TestCase):
         #
         f.loop(v2)
         self.assertEqual(f.get_result(), v2)
+
+    def test_closed_form(self) -> None:
+        """
+        The ``_advance`` fast path and the per-step path must agree, and
+        subclasses overriding only ``_computation`` must use the latter.
+        """
+        times: int = 10
+        f = self.CLASS()
+        f.loop(times)
+        fast_result: int = f.get_result()
+        #
+        f._result = 0
+        for _ in range(times):
+            f._computation()
+        self.assertEqual(fast_result, f.get_result())
+
+        #
+        class Counting(self.CLASS):
+            def _computation(self) -> None:
+                super(Counting, self)._computation()
+                self.calls += 1
+
+        c = Counting()
+        c.calls = 0
+        c.loop(times)
+        self.assertFalse(c._has_closed_form())
+        if self.BACKEND != "process":  # side effects stay in the workers
+            self.assertEqual(c.calls, times)
+        self.assertEqual(c.get_result(), fast_result)
+        #
+        for instance in (f, c):
+            self.assertEqual(instance.loop(-5), 0)
+            self.assertEqual(instance.get_result(), 0)
+            self.assertEqual(list(instance.iter_loop(-3)), [(0, 0)])
+            self.assertRaises(TypeError, instance.loop, 2.7)
+            self.assertRaises(TypeError, list, instance.iter_loop(2.7))
+
+    def test_resume(self) -> None:
+        """
+        Resumed loops and checkpoints continue from the current state
+        """
+        f = self.CLASS()
+        f.loop(3)
+        f.loop(2, resume=True)
+        self.assertEqual(f.get_result(), 5)
+        f.advance(4)
+        self.assertEqual(f.get_result(), 9)
+        #
+        state = json.loads(json.dumps(f.checkpoint()))
+        f.loop(1)
+        g = self.CLASS()
+        g.restore(state)
+        g.advance(1)
+        self.assertEqual(g.get_result(), 10)
+        self.assertRaises(ValueError, self.CLASS(5).restore, state)
+
+    def test_pickle(self) -> None:
+        """
+        Instances must round-trip through pickle with any protocol
+        """
+        f = self.CLASS(1000)
+        f.loop(3)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            g = pickle.loads(pickle.dumps(f, protocol))
+            self.assertIs(type(g), type(f))
+            self.assertEqual(len(g._x), 1000)
+            self.assertEqual(g.get_result(), 3)
+            g.loop(2, resume=True)
+            self.assertEqual(g.get_result(), 5)
+            self.assertEqual(f.get_result(), 3)
+
+    def test_iter_loop(self) -> None:
+        """
+        Snapshots of the generator, early stop and final result
+        """
+        f = self.CLASS()
+        snapshots = list(f.iter_loop(7, every=3))
+        self.assertEqual(snapshots, [(3, 3), (6, 6), (7, 7)])
+        f.loop(7)
+        self.assertEqual(snapshots[-1][1], f.get_result())
+        self.assertEqual(list(f.iter_loop(0)), [(0, 0)])
+        #
+        for done, result in f.iter_loop(100, every=2):
+            if done >= 4:
+                break
+        self.assertEqual(f.get_result(), 4)
+        self.assertEqual(list(f.iter_loop(2, 5, resume=True)), [(2, 6)])
+
+    def test_deadline(self) -> None:
+        """
+        Loops with a time budget stop early, report the iterations
+        completed and keep the matching result
+        """
+        f = self.CLASS(1000)
+        self.assertEqual(f.loop(7), 7)
+        self.assertEqual(f.loop(7, max_seconds=60), 7)
+        self.assertEqual(f.get_result(), 7)
+        # expired budget: only the first chunk runs
+        expired = time.monotonic() - 1
+        self.assertEqual(f.loop(50, deadline=expired, check_every=5), 5)
+        self.assertEqual(f.get_result(), 5)
+        self.assertEqual(f.loop(50, max_seconds=0, resume=True), 1)
+        self.assertEqual(f.get_result(), 6)
+
+        #
+        class Slow(self.CLASS):
+            def _computation(self) -> None:
+                super(Slow, self)._computation()
+                time.sleep(0.001)
+
+        s = Slow(1000)
+        done = s.loop(10 ** 6, max_seconds=0.05)
+        self.assertGreater(done, 1)
+        self.assertLess(done, 1000)
+        self.assertEqual(s.get_result(), done)
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestcaseFooNumpy(TestcaseFooCpu):
+    """
+    Applies all the Foo tests with the numpy backend.
+    """
+
+    BACKEND = "numpy"
+
+
+class TestcaseFooProcess(TestcaseFooCpu):
+    """
+    Applies all the Foo tests with the process backend.
+    """
+
+    BACKEND = "process"
+
+
+class TestcaseFooJit(TestcaseFooCpu):
+    """
+    Applies all the Foo tests with the jit backend (or its fallback).
+    """
+
+    BACKEND = "jit"
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib top-level exports and their import time. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import sys
+import unittest
+import subprocess
+import ml_lib
+
+
+def import_time_us(statement: str) -> (int, set):
+    """
+    Run ``statement`` in a fresh interpreter with ``-X importtime``.
+
+    :returns: The total cumulative microseconds spent importing top-level
+      ``ml_lib`` modules, and the set of all module names imported.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stderr
+    total, modules = 0, set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip())
+        if name.startswith(" ml_lib"):  # only one space: top-level import
+            total += int(cumulative)
+    return total, modules
+
+
+class InitTestCaseCpu(unittest.TestCase):
+    """
+    Lazy top-level exports and import-time budget.
+    """
+
+    # budgets in microseconds, generous to tolerate slow CI runners
+    IMPORT_BUDGET_US = 50000
+    IMPORT_CLASSES_BUDGET_US = 150000
+
+    def test_exports(self) -> None:
+        """
+        Lazy exports are listed and resolve to the submodule classes
+        """
+        from ml_lib.foo_module import Foo
+        from ml_lib.bar_module import Bar
+        from ml_lib.nested.baz_module import Baz
+
+        for name in ("Foo", "Bar", "Baz", "VERSION", "LICENSE"):
+            self.assertIn(name, ml_lib.__all__)
+            self.assertIn(name, dir(ml_lib))
+        self.assertIs(ml_lib.Foo, Foo)
+        self.assertIs(ml_lib.Bar, Bar)
+        self.assertIs(ml_lib.Baz, Baz)
+        self.assertRaises(AttributeError, getattr, ml_lib, "Quux")
+
+    def test_import_time(self) -> None:
+        """
+        ``import ml_lib`` doesn't load submodules, and stays within budget
+        """
+        total, modules = import_time_us("import ml_lib")
+        self.assertNotIn("ml_lib.foo_module", modules)
+        self.assertLess(total, self.IMPORT_BUDGET_US)
+        #
+        total, modules = import_time_us("from ml_lib import Foo, Bar")
+        self.assertIn("ml_lib.bar_module", modules)
+        self.assertNotIn("numpy", modules)
+        self.assertNotIn("multiprocessing", modules)
+        self.assertLess(total, self.IMPORT_CLASSES_BUDGET_US)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.instrument module. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import unittest
+from ml_lib.foo_module import Foo
+from ml_lib.bar_module import Bar
+from ml_lib import instrument
+
+
+class InstrumentTestCaseCpu(unittest.TestCase):
+    """
+    Hook registration, sampling and the disabled path.
+    """
+
+    def tearDown(self) -> None:
+        instrument.clear()
+
+    def test_hooks(self) -> None:
+        """
+        Sampled calls report class, iterations and latency
+        """
+        self.assertFalse(instrument.ENABLED)
+        starts, ends, sampled_ends = [], [], []
+        hook = instrument.register(
+            lambda obj, times: starts.append((obj, times)), ends.append
+        )
+        instrument.register(on_loop_end=sampled_ends.append, sample_every=2)
+        self.assertTrue(instrument.ENABLED)
+        f, b = Foo(), Bar(100)
+        f.loop(5)
+        b.loop(3)
+        f.loop(1)
+        self.assertEqual(starts, [(f, 5), (b, 3), (f, 1)])
+        self.assertEqual(
+            [(r.cls, r.iterations) for r in ends],
+            [(Foo, 5), (Bar, 3), (Foo, 1)],
+        )
+        self.assertTrue(all(r.seconds >= 0 for r in ends))
+        self.assertEqual([r.cls for r in sampled_ends], [Bar])
+        # loops stopped early report the iterations completed
+        f.loop(50, max_seconds=0, check_every=4)
+        self.assertEqual(starts[-1], (f, 50))
+        self.assertEqual(ends[-1].iterations, 4)
+        del starts[-1], ends[-1]
+        #
+        instrument.unregister(hook)
+        self.assertTrue(instrument.ENABLED)
+        instrument.clear()
+        self.assertFalse(instrument.ENABLED)
+        f.loop(2)
+        self.assertEqual(len(ends), 3)
+        self.assertEqual(f.get_result(), 2)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.jit module and the jit backend. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import unittest
+from unittest import mock
+from ml_lib.bar_module import Bar
+from ml_lib import backends
+from ml_lib.jit import HAS_NUMBA, get_kernel
+
+
+class JitTestCaseCpu(unittest.TestCase):
+    """
+    Compiled kernels must match the interpreter exactly, and the backend
+    must fall back transparently without Numba.
+    """
+
+    @unittest.skipUnless(HAS_NUMBA, "numba not installed")
+    def test_kernel(self) -> None:
+        """
+        The compiled kernel agrees with the Python one
+        """
+        import numpy
+
+        kernel = get_kernel("_bar_loop")
+        self.assertIs(kernel, get_kernel("_bar_loop"))
+        x = numpy.array([4, 1, 3, 3])
+        for value, times in [(3, 5), (4, 1), (7, 2), (7, 0)]:
+            self.assertEqual(
+                kernel(x, value, times), kernel.py_func(x, value, times)
+            )
+
+    def test_same_results(self) -> None:
+        """
+        Results and errors (including the partial result) match the
+        python backend, with and without Numba
+        """
+        for has_numba in {False, HAS_NUMBA}:
+            with mock.patch.object(backends, "HAS_NUMBA", has_numba):
+                for storage in ("list", "array"):
+                    results = []
+                    for backend in ("python", "jit"):
+                        b = Bar(1000, storage, backend=backend)
+                        b.loop(4)
+                        b.advance(3)
+                        c = Bar.from_iterable([5, 9, 1], storage, backend)
+                        c._index = None  # force the scan
+                        self.assertRaises(ValueError, c.loop, 6)
+                        results.append((b.get_result(), c.get_result()))
+                    self.assertEqual(results, [(7, 1), (7, 1)])
+
+    def test_huge_values(self) -> None:
+        """
+        Data beyond int64 falls back to the interpreter, with the same
+        error and partial result as the python backend
+        """
+        results = []
+        for backend in ("python", "jit"):
+            b = Bar(10, backend=backend)
+            b.extend([2 ** 70])
+            self.assertRaises(ValueError, b.loop, 2)  # looks up 10
+            b.extend([11])
+            b.loop(3, resume=True)  # looks up 11, at the end
+            results.append(b.get_result())
+        self.assertEqual(results, [4, 4])
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.memory module. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import gc
+import sys
+import unittest
+from ml_lib.foo_module import Foo
+from ml_lib.bar_module import Bar
+from ml_lib.mmap_module import MmapBar
+from ml_lib.cache import BUFFER_CACHE
+from ml_lib import memory
+
+
+class MemoryTestCaseCpu(unittest.TestCase):
+    """
+    Footprint measurement and budget enforcement.
+    """
+
+    def tearDown(self) -> None:
+        memory.set_budget(None)
+
+    def test_footprint(self) -> None:
+        """
+        Footprints reflect the data actually held
+        """
+        n = 100000
+        foo = Foo(n).memory_footprint()
+        self.assertLess(foo, 1000)
+        bar_list = Bar(n).memory_footprint()
+        bar_array = Bar(n, storage="array").memory_footprint()
+        # list: one pointer plus one int object per (non-cached) element
+        ints = sum(sys.getsizeof(i) for i in range(n))
+        self.assertGreater(bar_list, 8 * n + ints)
+        self.assertLess(bar_list, 8 * n + ints + 10000)
+        self.assertGreater(bar_array, 4 * n)
+        self.assertLess(bar_array, 4 * n + 10000)
+        with MmapBar(n) as m:
+            self.assertLess(m.memory_footprint(), 10000)
+        # shared buffers are counted once per instance
+        shared = Bar(n, storage="array", shared=True).memory_footprint()
+        self.assertGreater(shared, 4 * n)
+        self.assertGreater(
+            Bar.from_iterable(range(n)).memory_footprint(), bar_list
+        )
+
+    def test_slots(self) -> None:
+        """
+        Foo and Bar have no per-instance dict, and equal sizes share ranges
+        """
+        for obj in (Foo(10), Bar(10)):
+            self.assertFalse(hasattr(obj, "__dict__"))
+        self.assertIs(Foo(10)._x, Foo(10)._x)
+        self.assertIsNot(Foo(10)._x, Foo(11)._x)
+        self.assertLess(sys.getsizeof(Foo(10)), 100)
+
+    def test_budget(self) -> None:
+        """
+        Construction fails fast beyond the budget, and collected instances
+        release their share
+        """
+        budget = 2 * memory.estimate(10000, "array")
+        memory.set_budget(budget)
+        b1 = Bar(10000, storage="array")
+        b2 = Bar.from_iterable(range(10000), storage="array")
+        self.assertEqual(memory.used(), budget)
+        self.assertRaises(
+            memory.MemoryBudgetExceeded, Bar, 10000, storage="array"
+        )
+        self.assertRaises(MemoryError, Bar, 10 ** 9)
+        del b1, b2
+        gc.collect()
+        self.assertEqual(memory.used(), 0)
+        Bar(10000, storage="array")
+        Foo(10 ** 9)  # Foo isn't charged
+        memory.set_budget(None)
+        Bar(10000, storage="array")
+
+    def test_budget_shared(self) -> None:
+        """
+        Cache misses of shared Bars are charged while the buffer is cached,
+        or while the Bar lives if it is too large to be cached
+        """
+        BUFFER_CACHE.clear()
+        entry_bytes = memory.estimate(12345, "array")
+        memory.set_budget(1000)
+        self.assertRaises(
+            memory.MemoryBudgetExceeded, Bar, 10 ** 6, shared=True
+        )
+        memory.set_budget(10 * entry_bytes)
+        b1 = Bar(12345, storage="array", shared=True)
+        b2 = Bar(12345, storage="array", shared=True)  # a hit
+        self.assertEqual(memory.used(), entry_bytes)
+        del b1, b2
+        gc.collect()
+        self.assertEqual(memory.used(), entry_bytes)  # still cached
+        BUFFER_CACHE.clear()
+        gc.collect()
+        self.assertEqual(memory.used(), 0)
+        max_bytes = BUFFER_CACHE.max_bytes
+        BUFFER_CACHE.max_bytes = 0
+        try:
+            b = Bar(12345, storage="array", shared=True)
+            self.assertEqual(memory.used(), entry_bytes)
+            self.assertEqual(BUFFER_CACHE.stats()["entries"], 0)
+            del b
+            gc.collect()
+            self.assertEqual(memory.used(), 0)
+        finally:
+            BUFFER_CACHE.max_bytes = max_bytes
+
+    def test_budget_paged(self) -> None:
+        """
+        Paged data is charged page by page, as it is materialized
+        """
+        def page_bytes(number: int) -> int:
+            values = range(number * 1000, number * 1000 + 1000)
+            return memory.estimate(1000, "list", 0, values[-1])
+
+        budget = sum(page_bytes(number) for number in (0, 5, 9999))
+        memory.set_budget(budget)
+        try:
+            b = Bar(10 ** 7, storage="paged", page_size=1000)
+            self.assertEqual(memory.used(), 0)
+            b._x[5]
+            b._x[10 ** 7 - 1]
+            b._x[999]  # already materialized
+            self.assertEqual(memory.used(), page_bytes(0) + page_bytes(9999))
+            self.assertEqual(b.index(5000), 5000)
+            self.assertEqual(memory.used(), budget)
+            self.assertRaises(
+                memory.MemoryBudgetExceeded, b._x.__getitem__, 6000
+            )
+            self.assertEqual(len(b._x.pages), 3)
+            del b
+            gc.collect()
+            self.assertEqual(memory.used(), 0)
+        finally:
+            memory.set_budget(None)
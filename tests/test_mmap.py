@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.mmap_module. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import os
+import pickle
+import tempfile
+from array import array
+from ml_lib.bar_module import Bar
+from ml_lib.mmap_module import MmapBar
+from .test_foo import TestcaseFooCpu
+
+
+class MmapBarTestCaseCpu(TestcaseFooCpu):
+    """
+    Applies all the Foo tests to MmapBar, plus file handling tests.
+    """
+
+    CLASS = MmapBar
+
+    def test_same_as_bar(self) -> None:
+        """
+        MmapBar must behave like an in-memory Bar of the same size
+        """
+        with self.CLASS(1000) as m:
+            b = Bar(1000)
+            self.assertIsInstance(m, Bar)
+            self.assertEqual(len(m._x), len(b._x))
+            self.assertEqual(list(m._x), b._x)
+            self.assertEqual(m.index(999), b.index(999))
+            self.assertRaises(ValueError, m.index, 1000)
+            m.loop(3)
+            b.loop(3)
+            self.assertEqual(m.get_result(), b.get_result())
+            self.assertRaises(TypeError, m.append, 1)
+            self.assertRaises(TypeError, self.CLASS.from_iterable, [1, 0])
+            self.assertRaises(TypeError, self.CLASS.load, m._path)
+
+    def test_pickle(self) -> None:
+        """
+        Memory maps can't be pickled
+        """
+        with self.CLASS(1000) as m:
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                self.assertRaises(TypeError, pickle.dumps, m, protocol)
+
+    def test_open(self) -> None:
+        """
+        Opening existing files, with and without offset, and removal of
+        temporary files
+        """
+        m = self.CLASS(300)
+        path = m._path
+        self.assertEqual(m._x.itemsize, 2)
+        m.close()
+        self.assertFalse(os.path.exists(path))
+        #
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"header!!")
+            array("q", [3, 1 << 40, 3, 7]).tofile(f)
+        try:
+            with self.CLASS.open(path, "q", offset=8) as m:
+                self.assertEqual(list(m._x), [3, 1 << 40, 3, 7])
+                self.assertEqual(m.index(3), 0)
+                self.assertEqual(m.index(1 << 40), 1)
+                self.assertEqual(m.index(7), 3)
+                self.assertRaises(ValueError, m.index, 2 ** 70)
+                m.loop(2)  # looks up len - 1 = 3
+                self.assertEqual(m.get_result(), 2)
+            self.assertTrue(os.path.exists(path))
+        finally:
+            os.remove(path)
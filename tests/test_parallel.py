@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.parallel module. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import gc
+import unittest
+from unittest import mock
+from ml_lib import parallel
+from ml_lib.foo_module import Foo
+from ml_lib.bar_module import Bar
+from ml_lib.parallel import LoopPool, split
+
+
+class ParallelTestCaseCpu(unittest.TestCase):
+    """
+    Parallel loops must give the same results as serial ones.
+    """
+
+    def test_split(self) -> None:
+        """
+        Chunks add up to the total and differ by at most one
+        """
+        for times, parts in [(0, 3), (10, 3), (2, 5), (9, 3)]:
+            chunks = split(times, parts)
+            self.assertEqual(len(chunks), parts)
+            self.assertEqual(sum(chunks), times)
+            self.assertLessEqual(max(chunks) - min(chunks), 1)
+
+    def test_parallel_equals_serial(self) -> None:
+        """
+        ``loop(times, workers=N)`` and ``LoopPool`` match ``loop(times)``
+        """
+        for obj in (Foo(), Bar(1000), Bar.from_iterable([4, 1, 2, 3])):
+            for times in (0, 1, 7):
+                obj.loop(times)
+                serial = obj.get_result()
+                obj.loop(times, workers=3)
+                self.assertEqual(obj.get_result(), serial)
+        obj.advance(5, workers=2)
+        self.assertEqual(obj.get_result(), serial + 5)
+        self.assertEqual(obj.loop(9, workers=2, max_seconds=60), 9)
+        self.assertEqual(obj.get_result(), 9)
+        #
+        b = Bar(1000)
+        with LoopPool(b, 2) as pool:
+            for times in (5, 11):
+                pool.loop(times)
+                self.assertEqual(b.get_result(), times)
+
+    def test_pool_reuse(self) -> None:
+        """
+        ``loop(times, workers=N)`` starts a pool once per instance, worker
+        count and data, and closed forms run in the current process
+        """
+        with mock.patch.object(
+            parallel, "LoopPool", wraps=parallel.LoopPool
+        ) as pool:
+            Foo().loop(10, workers=2)
+            self.assertEqual(pool.call_count, 0)
+            b = Bar(1000)
+            for times in (3, 5):
+                b.loop(times, workers=2)
+                self.assertEqual(b.get_result(), times)
+            self.assertEqual(pool.call_count, 1)
+            b.loop(4, workers=3)
+            self.assertEqual(pool.call_count, 2)
+            b.append(1000)  # the workers must see the new data
+            b.loop(1, workers=2)  # looks up 1000
+            self.assertEqual(pool.call_count, 3)
+            self.assertEqual(b.get_result(), 1)
+        del b
+        gc.collect()
+        self.assertEqual(parallel._POOLS, {})
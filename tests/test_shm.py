@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.shm_module. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import os
+import sys
+import pickle
+import unittest
+import subprocess
+import multiprocessing
+from ml_lib.bar_module import Bar
+from ml_lib.shm_module import SharedBar
+from ml_lib.parallel import LoopPool
+from ml_lib.storage import HAS_NUMPY
+
+
+def _child_sum(name: str) -> int:
+    """
+    Attach from another process and read the data
+    """
+    with Bar.attach(name) as bar:
+        bar.loop(2)
+        return sum(bar._x) + bar.get_result()
+
+
+class SharedBarTestCaseCpu(unittest.TestCase):
+    """
+    Publishing, attaching, pickling and ownership of shared Bars.
+    """
+
+    def _run_script(self, script: str, *args: str):
+        """
+        Run ``script`` in a new interpreter from the repository root. Its
+        output is read until the resource tracker it started exits too.
+        """
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return subprocess.run(
+            [sys.executable, "-c", script, *args],
+            cwd=root,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=60,
+        )
+
+    def test_publish_attach(self) -> None:
+        """
+        Attached views see the published data and behave like Bar
+        """
+        storages = ["list", "array"] + (["numpy"] if HAS_NUMPY else [])
+        for storage in storages:
+            bar = Bar.from_iterable([7, 2, 40000, 3], storage)
+            bar.loop(3)
+            with bar.publish() as owner:
+                self.assertTrue(owner.owner)
+                self.assertEqual(owner.get_result(), 3)
+                with Bar.attach(owner.name) as attached:
+                    self.assertIsInstance(attached, Bar)
+                    self.assertFalse(attached.owner)
+                    self.assertEqual(list(attached._x), [7, 2, 40000, 3])
+                    self.assertEqual(attached.index(3), 3)
+                    attached.loop(2)
+                    self.assertEqual(attached.get_result(), 2)
+                    with self.assertRaises(TypeError):
+                        attached._x[0] = 1
+                    self.assertRaises(TypeError, attached.append, 1)
+                    self.assertRaises(
+                        TypeError, SharedBar.from_iterable, [1, 0]
+                    )
+                # detaching doesn't affect the owner
+                self.assertEqual(owner.index(40000), 2)
+            self.assertRaises(FileNotFoundError, Bar.attach, owner.name)
+
+    def test_processes(self) -> None:
+        """
+        Other processes attach by name, also through pickling
+        """
+        with Bar(1000).publish() as owner:
+            ctx = multiprocessing.get_context("spawn")
+            with ctx.Pool(1) as pool:
+                self.assertEqual(
+                    pool.apply(_child_sum, (owner.name,)), 499500 + 2
+                )
+            clone = pickle.loads(pickle.dumps(owner))
+            self.assertFalse(clone.owner)
+            self.assertEqual(clone.name, owner.name)
+            self.assertEqual(list(clone._x), list(owner._x))
+            clone.close()
+            with LoopPool(owner, 2) as pool:
+                pool.loop(5)
+            self.assertEqual(owner.get_result(), 5)
+
+    def test_resource_tracker(self) -> None:
+        """
+        Attaching from the owner process and its children must leave the
+        owner's registration with the resource tracker intact, i.e. there
+        are no tracker errors upon unlinking nor leaked blocks
+        """
+        script = (
+            "import multiprocessing\n"
+            "from ml_lib.bar_module import Bar\n"
+            "from tests.test_shm import _child_sum\n"
+            "if __name__ == '__main__':\n"
+            "    owner = Bar(10).publish()\n"
+            "    Bar.attach(owner.name).close()\n"
+            "    ctx = multiprocessing.get_context('spawn')\n"
+            "    with ctx.Pool(1) as pool:\n"
+            "        pool.apply(_child_sum, (owner.name,))\n"
+            "    owner.close()\n"
+        )
+        proc = self._run_script(script)
+        self.assertEqual(proc.returncode, 0)
+        self.assertEqual(proc.stderr.decode(), "")
+
+    def test_invalid_block(self) -> None:
+        """
+        Blocks not created by ``publish`` are rejected, and attaching to
+        them from another process must not unlink them when it exits
+        """
+        from multiprocessing import shared_memory
+
+        shm = shared_memory.SharedMemory(create=True, size=64)
+        try:
+            self.assertRaises(ValueError, SharedBar.attach, shm.name)
+            script = (
+                "import sys\n"
+                "from ml_lib.bar_module import Bar\n"
+                "try:\n"
+                "    Bar.attach(sys.argv[1])\n"
+                "except ValueError:\n"
+                "    pass\n"
+            )
+            proc = self._run_script(script, shm.name)
+            self.assertEqual(proc.returncode, 0)
+            self.assertEqual(proc.stderr.decode(), "")
+            shared_memory.SharedMemory(shm.name).close()  # still exists
+        finally:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Unit testing of the ml_lib.snapshot module and the ``save``/``load``
+methods. Doc:
+https://docs.python.org/3/library/unittest.html#assert-methods
+"""
+
+
+import os
+import tempfile
+import unittest
+from ml_lib.foo_module import Foo
+from ml_lib.bar_module import Bar
+from ml_lib.mmap_module import MmapBar
+from ml_lib.storage import HAS_NUMPY
+from ml_lib import snapshot
+
+
+class SnapshotTestCase(unittest.TestCase):
+    """
+    Round trips and detection of corrupted or incompatible snapshots.
+    """
+
+    def setUp(self) -> None:
+        fd, self.path = tempfile.mkstemp(suffix=".snap")
+        os.close(fd)
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+
+    def _patch(self, offset: int, data: bytes) -> None:
+        """
+        Overwrite the snapshot file at the given byte offset.
+        """
+        with open(self.path, "r+b") as f:
+            f.seek(offset)
+            f.write(data)
+
+    def test_round_trip(self) -> None:
+        """
+        Loaded instances must have the saved state, with and without mmap
+        """
+        foo = Foo(1234)
+        foo.loop(5)
+        foo.save(self.path)
+        loaded = Foo.load(self.path)
+        self.assertEqual(len(loaded._x), 1234)
+        self.assertEqual(loaded.get_result(), 5)
+        #
+        data = [5, 1 << 40, 2, 3]
+        storages = ["list", "array"] + (["numpy"] if HAS_NUMPY else [])
+        for storage in storages:
+            bar = Bar.from_iterable(data, storage)
+            bar.loop(2)
+            bar.save(self.path)
+            for mmap in (True, False):
+                loaded = Bar.load(self.path, mmap=mmap, verify=True)
+                self.assertEqual(list(loaded._x), data)
+                self.assertEqual(loaded.get_result(), 2)
+                self.assertEqual(loaded.index(2), 2)
+                if mmap:
+                    self.assertTrue(loaded._shared)
+                    self.assertNotEqual(loaded._storage, "list")
+                else:
+                    self.assertEqual(loaded._storage, storage)
+                loaded.append(4)
+                loaded.loop(1)
+                self.assertEqual(loaded.index(4), 4)
+                del loaded  # releases the map, if any
+        # list data is narrowed
+        Bar(100).save(self.path)
+        self.assertEqual(Bar.load(self.path)._x.itemsize, 1)
+
+    def test_round_trip_views(self) -> None:
+        """
+        Snapshots of MmapBar and SharedBar are loaded as Bar
+        """
+        shared = Bar.from_iterable([2, 1 << 40, 7]).publish()
+        with MmapBar(300) as m, shared as s:
+            for bar in (m, s):
+                bar.loop(2)
+                bar.save(self.path)
+                for mmap in (True, False):
+                    loaded = Bar.load(self.path, mmap=mmap, verify=True)
+                    self.assertIs(type(loaded), Bar)
+                    self.assertEqual(list(loaded._x), list(bar._x))
+                    self.assertEqual(loaded.get_result(), 2)
+                    del loaded
+
+    def test_invalid(self) -> None:
+        """
+        Foreign, corrupted, truncated and mismatching files must be detected
+        """
+        with open(self.path, "wb") as f:
+            f.write(b"not a snapshot at all, but long enough for a header")
+        self.assertRaises(ValueError, Foo.load, self.path)
+        #
+        Foo(10).save(self.path)
+        self.assertRaises(ValueError, Bar.load, self.path)
+        self._patch(len(snapshot.MAGIC), b"\xff")  # version
+        self.assertRaises(ValueError, Foo.load, self.path)
+        #
+        Bar(1000, storage="array").save(self.path)
+        size = os.path.getsize(self.path)
+        self._patch(snapshot.HEADER.size - 20, b"\x07")  # result
+        self.assertRaises(ValueError, Bar.load, self.path)
+        #
+        Bar(1000, storage="array").save(self.path)
+        self._patch(size - 1, b"\x00")  # last element
+        loaded = Bar.load(self.path)  # the data isn't read
+        self.assertEqual(loaded._x[0], 0)
+        del loaded
+        self.assertRaises(ValueError, Bar.load, self.path, verify=True)
+        self.assertRaises(ValueError, Bar.load, self.path, mmap=False)
+        #
+        Bar(1000, storage="array").save(self.path)
+        os.truncate(self.path, size - 2)
+        self.assertRaises(ValueError, Bar.load, self.path)